@@ -3,12 +3,28 @@ tests to run and debug your minimax and alphabeta agents locally.  The test
 cases used by the project assistant are not public.
 """
 
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
 import unittest
 
 import isolation
+import competition_agent
 import game_agent
+import opening_book
+import sample_players
 
 from importlib import reload
+from isolation import tablebase
+
+try:
+    import numpy
+    from isolation import batch, rollout
+except ImportError:
+    numpy = None
 
 
 class IsolationTest(unittest.TestCase):
@@ -20,6 +36,768 @@ class IsolationTest(unittest.TestCase):
         self.player2 = "Player2"
         self.game = isolation.Board(self.player1, self.player2)
 
+    def test_game_agent_imports_in_sandbox(self):
+        # the project assistant's sandbox blocks most of the standard
+        # library; the modules only some players need are imported lazily
+        script = ("import sys; sys.modules.update(multiprocessing=None, mmap=None); "
+                  "import game_agent; player = game_agent.AlphaBetaPlayer(); "
+                  "game = game_agent.isolation.Board(player, 'Opponent'); "
+                  "player.time_left = lambda: 1000.; player.alphabeta(game, 2)")
+        subprocess.check_call([sys.executable, "-c", script],
+                              cwd=os.path.dirname(os.path.abspath(__file__)))
+
+    def test_in_place_search_matches_copy_search(self):
+        for player_cls in (game_agent.MinimaxPlayer, game_agent.AlphaBetaPlayer):
+            for seed in range(5):
+                moves = []
+                for in_place in (False, True):
+                    player = player_cls(in_place=in_place)
+                    player.time_left = lambda: 1000.
+                    game = isolation.Board(player, "Opponent")
+                    game.apply_move((2, 3))
+                    game.apply_move((3, 3))
+                    before = game.to_string()
+                    random.seed(seed)
+                    if player_cls is game_agent.MinimaxPlayer:
+                        moves.append(player.minimax(game, 3))
+                    else:
+                        moves.append(player.alphabeta(game, 4))
+                    self.assertEqual(game.to_string(), before)
+                self.assertEqual(moves[0], moves[1])
+
+    def test_in_place_search_restores_board_on_timeout(self):
+        player = game_agent.AlphaBetaPlayer(in_place=True)
+        game = isolation.Board(player, "Opponent")
+        game.apply_move((2, 3))
+        game.apply_move((3, 3))
+        before = game.to_string()
+        calls = []
+
+        def time_left():
+            calls.append(1)
+            return 1000. if len(calls) < 50 else 0.
+
+        player.time_left = time_left
+        with self.assertRaises(game_agent.SearchTimeout):
+            player.alphabeta(game, 6)
+        self.assertEqual(game.to_string(), before)
+        self.assertEqual(game.move_count, 2)
+
+    def test_transposition_table_preserves_search_value(self):
+        for seed in range(3):
+            values = []
+            for tt_size in (None, 2**12):
+                player = game_agent.AlphaBetaPlayer(in_place=True, tt_size=tt_size)
+                player.time_left = lambda: 1000.
+                game = isolation.Board(player, "Opponent")
+                game.apply_move((2, 3))
+                game.apply_move((3, 3))
+                random.seed(seed)
+                for depth in range(1, 6):
+                    value, _ = player.max_value(game, depth, float("-inf"), float("inf"))
+                values.append(value)
+            self.assertEqual(values[0], values[1])
+            self.assertGreater(player.tt.stats()["hits"], 0)
+
+    def test_transposition_table_separates_seats(self):
+        values = []
+        for tt_size in (None, 2**12):
+            player = game_agent.AlphaBetaPlayer(tt_size=tt_size)
+            player.time_left = lambda: 1000.
+            # fill the table with values from the first seat ...
+            game = isolation.Board(player, "Opponent")
+            for move in [(2, 2), (4, 5), (4, 3), (6, 4)]:
+                game.apply_move(move)
+            player.alphabeta(game, 3)
+            # ... then search a position one ply above the same cells, with
+            # the player in the second seat
+            game = isolation.Board("Opponent", player)
+            for move in [(2, 2), (4, 5), (4, 3)]:
+                game.apply_move(move)
+            player.alphabeta(game, 4)
+            value, _ = player.max_value(game, 4, float("-inf"), float("inf"))
+            values.append(value)
+        self.assertEqual(values[0], values[1])
+
+    def test_transposition_table_seat_ignores_move_count(self):
+        values = []
+        for tt_size in (None, 2**12):
+            player = game_agent.AlphaBetaPlayer(tt_size=tt_size)
+            player.time_left = lambda: 1000.
+            game = isolation.Board(player, "Opponent")
+            for move in [(2, 2), (4, 5), (4, 3), (6, 4)]:
+                game.apply_move(move)
+            player.alphabeta(game, 3)
+            # a board restored from a state keeps a move count of zero, so
+            # the parity of the move count does not give the seat to move
+            source = isolation.Board("Opponent", player)
+            for move in [(2, 2), (4, 5), (4, 3)]:
+                source.apply_move(move)
+            game = isolation.Board("Opponent", player)
+            game._board_state = source._board_state
+            self.assertEqual(game.move_count, 0)
+            player.alphabeta(game, 4)
+            values.append(player._root_value)
+        self.assertEqual(values[0], values[1])
+
+    def test_transposition_table_is_bounded(self):
+        table = game_agent.TranspositionTable(max_entries=64)
+        for key in range(1000):
+            table.store(key, key % 7, 0., table.EXACT, (0, 0))
+        self.assertLessEqual(table.stats()["entries"], 64)
+        self.assertEqual(table.stats()["stores"], 1000)
+        # the depth-preferred slot keeps the deepest result of the turn
+        table.store(5, 9, 1., table.EXACT, (1, 1))
+        table.store(5 + table.num_buckets, 0, 2., table.EXACT, (2, 2))
+        self.assertEqual(table.probe(5)[2], 1.)
+        self.assertEqual(table.probe(5 + table.num_buckets)[2], 2.)
+
+    def test_pv_ordering_searches_previous_best_move_first(self):
+        player = game_agent.AlphaBetaPlayer(pv_ordering=True)
+        player.time_left = lambda: 1000.
+        game = isolation.Board(player, "Opponent")
+        game.apply_move((2, 3))
+        game.apply_move((3, 3))
+        best_move = player.alphabeta(game, 4)
+        self.assertEqual(player._pv_moves[game.hash()], best_move)
+        self.assertEqual(player._ordered_moves(game, player, 0)[0], best_move)
+        self.assertEqual(player.alphabeta(game, 4), best_move)
+
+    def test_move_ordering_preserves_search_value(self):
+        values = []
+        for ordering in (None, game_agent.MoveOrdering()):
+            player = game_agent.AlphaBetaPlayer(ordering=ordering)
+            player.time_left = lambda: 1000.
+            game = isolation.Board(player, "Opponent")
+            game.apply_move((2, 3))
+            game.apply_move((3, 3))
+            player.alphabeta(game, 5)
+            values.append(player.max_value(game, 5, float("-inf"), float("inf"))[0])
+        self.assertEqual(values[0], values[1])
+        self.assertTrue(ordering.history)
+        self.assertTrue(any(ordering.killers))
+
+    def test_move_ordering_with_minimax(self):
+        ordering = game_agent.MoveOrdering()
+        player = game_agent.MinimaxPlayer(ordering=ordering)
+        game = isolation.Board(player, "Opponent")
+        game.apply_move((2, 3))
+        game.apply_move((3, 3))
+        move = player.get_move(game, lambda: 1000.)
+        self.assertIn(move, game.get_legal_moves(player))
+        self.assertTrue(ordering.history)
+        ordering.enabled = False
+        ordering.new_search()
+        ordering.record(player, 0, move, 3)
+        self.assertFalse(ordering.killers)
+
+    def test_iterative_deepening_stops_when_resolved(self):
+        player = game_agent.AlphaBetaPlayer(score_fn=sample_players.improved_score)
+        game = isolation.Board(player, "Opponent", 3, 3)
+        game.apply_move((0, 0))
+        game.apply_move((2, 2))
+        move = player.get_move(game, lambda: 1000.)
+        self.assertIn(move, game.get_legal_moves(player))
+        self.assertIn(player.search_stats["reason"], ("proved win", "proved loss"))
+
+        # reaching every terminal without a proof only happens with scores
+        # that do not report wins and losses as infinite
+        player = game_agent.AlphaBetaPlayer(score_fn=lambda game, player: 0.)
+        game = isolation.Board(player, "Opponent", 4, 4)
+        for move in [(0, 0), (3, 3), (1, 2), (2, 1), (3, 1), (0, 2)]:
+            game.apply_move(move)
+        move = player.get_move(game, lambda: 1000.)
+        self.assertEqual(player.search_stats["reason"], "exhausted")
+        self.assertIn(move, game.get_legal_moves(player))
+
+    def test_deadline_samples_clock_periodically(self):
+        clock = [100.]
+        samples = []
+
+        def time_left():
+            samples.append(clock[0])
+            return clock[0]
+
+        deadline = game_agent.Deadline(sample_ms=1.)
+        deadline.start(time_left, 10.)
+        with self.assertRaises(game_agent.SearchTimeout):
+            while True:
+                clock[0] -= 0.01  # 100 nodes per ms
+                deadline.tick()
+        self.assertGreater(clock[0], 9.)
+        # 9000 nodes, sampled about once per millisecond
+        self.assertLess(len(samples), 200)
+    def test_deadline_skips_passes_that_cannot_finish(self):
+        clock = [150.]
+        deadline = game_agent.Deadline()
+        deadline.start(lambda: clock[0], 10.)
+        for nodes, duration in [(100, 5.), (300, 15.), (900, 45.)]:
+            clock[0] -= duration
+            deadline.pass_done(nodes)
+            fits = deadline.next_pass_fits()
+        # 85ms left, the next pass needs about 3 * 45ms
+        self.assertFalse(fits)
+
+    def test_deadline_search_returns_in_time(self):
+        player = game_agent.AlphaBetaPlayer(score_fn=sample_players.improved_score,
+                                            deadline=True)
+        game = isolation.Board(player, sample_players.RandomPlayer())
+        winner, _, termination = game.play(time_limit=150)
+        self.assertNotEqual(termination, "timeout")
+
+    def test_negamax_matches_minimax_value(self):
+        for seed in range(3):
+            for tt_size in (None, 2**12):
+                values = []
+                for negamax, aspiration in ((False, None), (True, None), (True, 0.5)):
+                    player = game_agent.AlphaBetaPlayer(
+                        score_fn=sample_players.improved_score, in_place=True,
+                        tt_size=tt_size, negamax=negamax, aspiration=aspiration)
+                    player.time_left = lambda: 1000.
+                    game = isolation.Board(player, "Opponent")
+                    game.apply_move((2, 3))
+                    game.apply_move((3, 3))
+                    random.seed(seed)
+                    for depth in range(1, 6):
+                        move = player._aspiration_search(game, depth)
+                        self.assertIn(move, game.get_legal_moves())
+                    values.append(player._root_value)
+                self.assertEqual(values[0], values[1])
+                self.assertEqual(values[0], values[2])
+
+    def test_symmetric_root_moves_are_searched_once(self):
+        for negamax in (False, True):
+            results = []
+            for symmetry in (False, True):
+                player = game_agent.AlphaBetaPlayer(
+                    score_fn=sample_players.improved_score, in_place=True,
+                    negamax=negamax, symmetry=symmetry)
+                player.time_left = lambda: 1000.
+                game = isolation.Board("Opponent", player, 5, 5)
+                game.apply_move((2, 2))
+                player.alphabeta(game, 3)
+                results.append((player._root_value, player.nodes))
+            self.assertEqual(results[0][0], results[1][0])
+            self.assertLess(results[1][1], results[0][1] / 2)
+
+        player = game_agent.MinimaxPlayer(
+            search_depth=2, score_fn=sample_players.improved_score, symmetry=True)
+        player.time_left = lambda: 1000.
+        game = isolation.Board(player, "Opponent", 5, 5)
+        self.assertIn(player.minimax(game, 2), game.get_legal_moves())
+        self.assertEqual(player.nodes, 6 * 25)
+
+    def test_endgame_solver_matches_search(self):
+        random.seed(0)
+        solved = 0
+        while solved < 10:
+            player = game_agent.AlphaBetaPlayer(
+                score_fn=sample_players.improved_score, endgame=True)
+            game = isolation.Board(player, "Opponent", 5, 5)
+            while not game.is_partitioned() and game.get_legal_moves():
+                game.apply_move(random.choice(game.get_legal_moves()))
+            if game.active_player is not player or not game.is_partitioned():
+                continue
+            move = player.get_move(game, lambda: 1000.)
+            self.assertEqual(player.search_stats["reason"], "solved")
+            value = player.search_stats["value"]
+            if game.get_legal_moves():
+                self.assertIn(move, game.get_legal_moves())
+            player.endgame = None
+            player.get_move(game, lambda: 1000.)
+            self.assertEqual(player.search_stats["value"], value)
+            solved += 1
+
+    def test_proof_number_search_matches_search(self):
+        random.seed(1)
+        proved = 0
+        while proved < 10:
+            player = game_agent.AlphaBetaPlayer(
+                score_fn=sample_players.improved_score, proof_threshold=15)
+            game = isolation.Board(player, "Opponent", 5, 5)
+            while len(game.get_blank_spaces()) > 15 and game.get_legal_moves():
+                game.apply_move(random.choice(game.get_legal_moves()))
+            if game.active_player is not player or not game.get_legal_moves():
+                continue
+            value, move = player.pns.solve(game, player, lambda: 1000., 0.)
+            self.assertIn(move, game.get_legal_moves())
+            player.pns = None
+            player.get_move(game, lambda: 1000.)
+            self.assertEqual(player.search_stats["value"], value)
+            if value == float("inf"):
+                # a proven win is played without searching
+                player.pns = game_agent.ProofNumberSearch()
+                self.assertIn(player.get_move(game, lambda: 1000.), game.get_legal_moves())
+                self.assertEqual(player.search_stats["reason"], "proved win")
+                self.assertEqual(player.search_stats["nodes"], 0)
+            proved += 1
+
+    def test_ponder_reuses_search_on_opponent_reply(self):
+        player = game_agent.AlphaBetaPlayer(
+            score_fn=sample_players.improved_score, in_place=True, ponder=True)
+        try:
+            game = isolation.Board(player, "Opponent", 5, 5)
+            game.apply_move((2, 2))
+            game.apply_move((0, 0))
+            move = player.get_move(game, lambda: 100.)
+            game.apply_move(move)
+            time.sleep(0.5)
+            game.apply_move(game.get_legal_moves()[0])
+            player.get_move(game, lambda: 100.)
+            self.assertGreater(player.search_stats["ponder"], 0)
+
+            # an unrelated position is not taken from the ponderer
+            other = isolation.Board(player, "Opponent", 5, 5)
+            other.apply_move((0, 4))
+            other.apply_move((4, 4))
+            time.sleep(0.1)
+            player.get_move(other, lambda: 100.)
+            self.assertIsNone(player.search_stats["ponder"])
+        finally:
+            player.close()
+
+    def test_root_splitter_merges_at_common_depth(self):
+        merge = game_agent.RootSplitter._merge
+        inf = float("inf")
+        # worker 2 only finished depth 2, so depth 3 of worker 1 is ignored
+        results = [([(1, (0, 0), 1.), (2, (0, 0), 2.), (3, (0, 0), 5.)], False),
+                   ([(1, (1, 1), 0.), (2, (1, 1), 3.)], False)]
+        self.assertEqual(merge(results, None), (2, (1, 1), 3.))
+        # resolved shares count at any depth, and a proved win is taken
+        results.append(([(1, (2, 2), -inf)], True))
+        self.assertEqual(merge(results, None), (2, (1, 1), 3.))
+        results.append(([(1, (3, 3), 0.), (2, (3, 3), inf)], True))
+        self.assertEqual(merge(results, None), (2, (3, 3), inf))
+        self.assertEqual(merge([([], False)], (4, 4)), (None, (4, 4), -inf))
+
+        values = []
+        for workers in (None, 2):
+            player = game_agent.AlphaBetaPlayer(
+                score_fn=sample_players.improved_score, in_place=True,
+                tt_size=2**12, workers=workers)
+            try:
+                game = isolation.Board(player, "Opponent", 5, 5)
+                for move in [(2, 2), (0, 0), (0, 1), (2, 1)]:
+                    game.apply_move(move)
+                move = player.get_move(game, lambda: 1000.)
+                self.assertIn(move, game.get_legal_moves())
+                values.append(player.search_stats["value"])
+            finally:
+                player.close()
+        self.assertEqual(values[0], values[1])
+
+    def test_mcts_player_reuses_tree(self):
+        # the 10 ms margin of the other players rather than the 1 ms one of
+        # the competition, which a busy machine can overrun
+        player = competition_agent.CustomPlayer(timeout=10.)
+        game = isolation.Board(player, "Opponent")
+        game.apply_move((3, 3))
+        game.apply_move((2, 3))
+        start = time.time()
+        time_left = lambda: 150. - (time.time() - start) * 1000
+        move = player.get_move(game, time_left)
+        self.assertIn(move, game.get_legal_moves())
+        self.assertGreater(time_left(), 0)
+        self.assertGreater(player.search_stats["playouts"], 0)
+        self.assertGreater(player.search_stats["playouts_per_sec"], 0)
+        self.assertEqual(player.search_stats["reused"], 0)
+
+        # the most visited reply of the opponent is certainly in the tree
+        root = player._tree.find_child(move)
+        reply = max(root.children, key=lambda c: c.visits)
+        visits = reply.visits
+        game.apply_move(move)
+        game.apply_move(reply.move)
+        start = time.time()
+        player.get_move(game, time_left)
+        self.assertEqual(player.search_stats["reused"], visits)
+
+
+def reference_moves(game, player):
+    """Knight moves for `player` computed cell by cell, without bitboards."""
+    loc = game.get_player_location(player)
+    if loc is None:
+        return game.get_blank_spaces()
+    r, c = loc
+    return [(r + dr, c + dc) for dr, dc in isolation.isolation.KNIGHT_DIRECTIONS
+            if game.move_is_legal((r + dr, c + dc))]
+
+
+class BoardTest(unittest.TestCase):
+    """Unit tests for the isolation.Board game engine"""
+
+    def setUp(self):
+        self.player1 = "Player1"
+        self.player2 = "Player2"
+
+    def play_random_games(self, width, height, num_games=20):
+        """Yield every position of `num_games` random games."""
+        for _ in range(num_games):
+            game = isolation.Board(self.player1, self.player2, width, height)
+            while True:
+                yield game
+                moves = game.get_legal_moves()
+                if not moves:
+                    break
+                game.apply_move(random.choice(moves))
+
+    def test_legal_moves_match_reference(self):
+        for width, height in [(7, 7), (5, 8), (9, 6)]:
+            for game in self.play_random_games(width, height):
+                for player in (self.player1, self.player2):
+                    self.assertEqual(sorted(game.get_legal_moves(player)),
+                                     sorted(reference_moves(game, player)))
+
+    def test_move_counts(self):
+        for game in self.play_random_games(6, 7):
+            for player in (self.player1, self.player2):
+                moves = reference_moves(game, player)
+                open_from = [sum(game.move_is_legal((r + dr, c + dc))
+                                 for dr, dc in isolation.isolation.KNIGHT_DIRECTIONS)
+                             for r, c in moves]
+                self.assertEqual(game.count_moves(player), len(moves))
+                self.assertEqual([game.count_moves_from(m) for m in moves], open_from)
+                self.assertEqual(game.count_second_order_moves(player), sum(open_from))
+            self.assertEqual(game.count_moves(), len(game.get_legal_moves()))
+
+    def test_knight_neighbours(self):
+        for width, height in [(7, 7), (5, 8)]:
+            table = isolation.isolation.knight_neighbours(width, height)
+            self.assertEqual(len(table), width * height)
+            for (r, c), neighbours in table.items():
+                self.assertEqual(set(neighbours), set(
+                    (r + dr, c + dc) for dr, dc in isolation.isolation.KNIGHT_DIRECTIONS
+                    if 0 <= r + dr < height and 0 <= c + dc < width))
+            self.assertIs(isolation.isolation.knight_neighbours(width, height), table)
+
+    def test_terminal_state(self):
+        for game in self.play_random_games(7, 7):
+            has_moves = bool(reference_moves(game, game.active_player))
+            self.assertEqual(game.is_loser(game.active_player), not has_moves)
+            self.assertEqual(game.is_winner(game.inactive_player), not has_moves)
+            self.assertEqual(game.game_over(), not has_moves)
+            if not has_moves:
+                self.assertEqual(game.utility(game.active_player), float("-inf"))
+                self.assertEqual(game.utility(game.inactive_player), float("inf"))
+                self.assertEqual(game.terminal_value(game.active_player), float("-inf"))
+                self.assertEqual(game.terminal_value(game.inactive_player), float("inf"))
+            else:
+                self.assertIsNone(game.terminal_value(game.active_player))
+
+    def test_cached_terminal_state_follows_moves(self):
+        game = isolation.Board(self.player1, self.player2, 3, 3)
+        for move in [(0, 0), (1, 1)]:
+            game.apply_move(move)
+        self.assertFalse(game.game_over())
+        game.push_move((1, 2))
+        self.assertTrue(game.game_over())
+        self.assertTrue(game.copy().game_over())
+        game.pop_move()
+        self.assertFalse(game.game_over())
+        game.apply_move((2, 1))
+        self.assertEqual(game.terminal_value(self.player1), float("inf"))
+
+    def test_board_state_round_trip(self):
+        for game in self.play_random_games(5, 6, num_games=5):
+            clone = isolation.Board(self.player1, self.player2, 5, 6)
+            clone._board_state = game._board_state
+            self.assertEqual(clone.to_string(), game.to_string())
+            self.assertEqual(clone.active_player, game.active_player)
+
+    def test_copy_is_independent(self):
+        game = isolation.Board(self.player1, self.player2, 5, 5)
+        self.assertFalse(hasattr(game, "__dict__"))
+        self.assertIsNone(game.copy().get_player_location(self.player1))
+        game.push_move((2, 2))
+        clone = game.copy()
+        clone.push_move((0, 0))
+        clone.apply_move((1, 4))
+        self.assertEqual(len(game.get_blank_spaces()), 24)
+        self.assertEqual(len(clone.get_blank_spaces()), 22)
+        self.assertEqual(clone.pop_move(), (0, 0))
+        self.assertEqual(game.pop_move(), (2, 2))
+        self.assertEqual(game.to_string(), isolation.Board(
+            self.player1, self.player2, 5, 5).to_string())
+
+    def test_incremental_hash(self):
+        for game in self.play_random_games(7, 7, num_games=5):
+            self.assertEqual(game.hash(), game._zobrist_hash())
+            self.assertEqual(game.copy().hash(), game.hash())
+
+    def test_hash_transpositions(self):
+        game_a = isolation.Board(self.player1, self.player2)
+        game_b = isolation.Board(self.player1, self.player2)
+        for move in [(0, 0), (6, 6), (1, 2), (5, 4), (3, 3), (4, 6)]:
+            game_a.apply_move(move)
+        for move in [(3, 3), (6, 6), (1, 2), (5, 4), (0, 0), (4, 6)]:
+            game_b.apply_move(move)
+        self.assertNotEqual(game_a.to_string(), game_b.to_string())
+        self.assertNotEqual(game_a.hash(), game_b.hash())
+        game_b = isolation.Board(self.player1, self.player2)
+        for move in [(1, 2), (6, 6), (0, 0), (5, 4), (3, 3), (4, 6)]:
+            game_b.apply_move(move)
+        self.assertEqual(game_a.hash(), game_b.hash())
+
+    def test_canonical_key(self):
+        for width, height, num_transforms in [(7, 7, 8), (5, 6, 4)]:
+            for _ in range(5):
+                game = isolation.Board(self.player1, self.player2, width, height)
+                history = []
+                for _ in range(8):
+                    moves = game.get_legal_moves()
+                    if not moves:
+                        break
+                    history.append(random.choice(moves))
+                    game.apply_move(history[-1])
+                key, transform = game.canonical_key()
+                self.assertEqual(key, min(game.canonical_key()[0], game.hash()))
+                for t in range(num_transforms):
+                    image = isolation.Board(self.player1, self.player2, width, height)
+                    for move in history:
+                        image.apply_move(game.transform_move(move, t))
+                    self.assertEqual(image.canonical_key()[0], key)
+                    self.assertEqual(game.transform_move(
+                        game.transform_move(history[-1], t), t, inverse=True), history[-1])
+                # the canonical position is the history mapped through `transform`
+                canonical = isolation.Board(self.player1, self.player2, width, height)
+                for move in history:
+                    canonical.apply_move(game.transform_move(move, transform))
+                self.assertEqual(canonical.hash(), key)
+
+    def test_distinct_moves(self):
+        game = isolation.Board(self.player1, self.player2)
+        self.assertEqual(len(game.symmetries()), 8)
+        self.assertEqual(len(game.distinct_moves(game.get_legal_moves())), 10)
+        game.apply_move((0, 0))
+        self.assertEqual(game.symmetries(), [0, 4])
+        moves = game.get_legal_moves()
+        distinct = game.distinct_moves(moves)
+        self.assertEqual(len(distinct), 27)
+        self.assertEqual(distinct, [m for m in moves if m in distinct])
+        game.apply_move((3, 3))
+        self.assertEqual(len(game.distinct_moves(game.get_legal_moves())), 1)
+        game.apply_move((1, 2))
+        self.assertEqual(game.symmetries(), [0])
+        moves = game.get_legal_moves()
+        self.assertEqual(game.distinct_moves(moves), moves)
+
+    def test_longest_path(self):
+        game = isolation.Board(self.player1, self.player2, 5, 5)
+        for move in [(0, 0), (4, 4), (1, 2), (2, 3)]:
+            game.apply_move(move)
+        self.assertFalse(game.is_partitioned())
+
+        # a player alone on a 3x4 corner of the board can visit all of it
+        game = isolation.Board(self.player1, self.player2, 8, 8)
+        game._blocked = game._geometry.full_mask & ~sum(
+            1 << (r + c * 8) for r in range(3) for c in range(4))
+        game.apply_move((0, 0))
+        game.apply_move((7, 7))
+        self.assertTrue(game.is_partitioned())
+        memo = {}
+        length, move = game.longest_path(self.player1, memo)
+        self.assertEqual(length, 11)
+        self.assertIn(move, game.get_legal_moves(self.player1))
+        self.assertEqual(game.longest_path(self.player2), (0, (-1, -1)))
+        self.assertIn(game.longest_path(self.player1, limit=4)[0], range(4, 12))
+        self.assertEqual(game.longest_path(self.player1, memo)[0], 11)
+        self.assertEqual(game.forecast_move(move).longest_path(self.player1, memo)[0], 10)
+
+    def test_push_pop_round_trip(self):
+        game = isolation.Board(self.player1, self.player2)
+        history = []
+        while game.get_legal_moves():
+            history.append((game.to_string(), game.active_player, game.move_count,
+                            game.hash()))
+            game.push_move(random.choice(game.get_legal_moves()))
+        while history:
+            game.pop_move()
+            self.assertEqual((game.to_string(), game.active_player, game.move_count,
+                              game.hash()), history.pop())
+
+
+@unittest.skipIf(numpy is None, "NumPy is not installed")
+class TablebaseTest(unittest.TestCase):
+    """Tests for the endgame tablebase"""
+
+    @classmethod
+    def setUpClass(cls):
+        fd, cls.path = tempfile.mkstemp(suffix=".tb")
+        os.close(fd)
+        tablebase.build(cls.path, 5, 5, max_cells=4, processes=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.path)
+
+    def test_region_keys(self):
+        levels = tablebase.region_keys(3, 3, 2)
+        # a corner reaches two cells, which reach nothing else from it
+        self.assertIn((0, 1 << 5), levels[1])
+        self.assertIn((0, 1 << 5 | 1 << 7), levels[2])
+        self.assertEqual(len(set(levels[2])), len(levels[2]))
+
+    def test_probe_matches_longest_paths(self):
+        table = tablebase.Tablebase(self.path)
+        random.seed(0)
+        hits = 0
+        for _ in range(300):
+            game = isolation.Board("Player1", "Player2", 5, 5)
+            while game.get_legal_moves():
+                game.apply_move(random.choice(game.get_legal_moves()))
+                value = table.probe(game, "Player1")
+                if value is None:
+                    continue
+                self.assertTrue(game.is_partitioned() or game.game_over())
+                own = game.longest_path(game.active_player)[0]
+                other = game.longest_path(game.inactive_player)[0]
+                won = (own > other) == (game.active_player == "Player1")
+                self.assertEqual(value, float("inf") if won else float("-inf"))
+                hits += 1
+        self.assertGreater(hits, 0)
+        table.close()
+
+    def test_search_with_tablebase_preserves_value(self):
+        random.seed(1)
+        for _ in range(10):
+            game = isolation.Board("Player1", "Player2", 5, 5)
+            history = []
+            while len(game.get_blank_spaces()) > 13 and game.get_legal_moves():
+                history.append(random.choice(game.get_legal_moves()))
+                game.apply_move(history[-1])
+            values = []
+            for path in (None, self.path):
+                player = game_agent.AlphaBetaPlayer(
+                    score_fn=sample_players.improved_score, tablebase=path)
+                game = isolation.Board(player, "Opponent", 5, 5)
+                for move in history:
+                    game.apply_move(move)
+                player.get_move(game, lambda: 1000.)
+                values.append(player.search_stats["value"])
+            self.assertEqual(values[0], values[1])
+
+
+class OpeningBookTest(unittest.TestCase):
+    """Tests for the opening book"""
+
+    @classmethod
+    def setUpClass(cls):
+        fd, cls.path = tempfile.mkstemp(suffix=".book")
+        os.close(fd)
+        opening_book.build(cls.path, 5, 5, plies=2, time_limit=20., processes=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.path)
+
+    def test_book_covers_random_openings(self):
+        book = opening_book.OpeningBook(self.path)
+        self.assertEqual(len(book), len(opening_book.opening_positions(5, 5, 2)))
+        for first in isolation.Board("Player1", "Player2", 5, 5).get_blank_spaces():
+            game = isolation.Board("Player1", "Player2", 5, 5)
+            game.apply_move(first)
+            self.assertIn(book.lookup(game), game.get_legal_moves())
+            for reply in game.get_legal_moves():
+                position = game.forecast_move(reply)
+                move = book.lookup(position)
+                self.assertIn(move, position.get_legal_moves())
+                # the same book entry answers every symmetric image
+                transform = random.randrange(8)
+                image = isolation.Board("Player1", "Player2", 5, 5)
+                image.apply_move(game.transform_move(first, transform))
+                image.apply_move(game.transform_move(reply, transform))
+                self.assertEqual(
+                    position.forecast_move(move).canonical_key()[0],
+                    image.forecast_move(book.lookup(image)).canonical_key()[0])
+
+    def test_use_book_falls_back_to_search(self):
+        player = opening_book.use_book(
+            game_agent.AlphaBetaPlayer(score_fn=sample_players.improved_score),
+            opening_book.OpeningBook(self.path))
+        game = isolation.Board(player, "Opponent", 5, 5)
+        for move in [(2, 2), (0, 1)]:
+            game.apply_move(move)
+        # a book move needs no time
+        move = player.get_move(game, lambda: 0.)
+        self.assertIn(move, game.get_legal_moves())
+        game.apply_move(move)
+        game.apply_move(game.get_legal_moves()[0])
+        self.assertIn(player.get_move(game, lambda: 1000.), game.get_legal_moves())
+        self.assertIsNotNone(player.search_stats["depth"])
+
+
+class RolloutTest(unittest.TestCase):
+    """Unit tests for the vectorized playouts in isolation.rollout"""
+
+    def test_knight_table_matches_board(self):
+        for width, height in ((7, 7), (5, 8)):
+            game = isolation.Board("Player1", "Player2", width, height)
+            table = rollout.knight_table(width, height)
+            for idx, mask in enumerate(game._geometry.knight_masks):
+                cells = set(int(i) for i in table[idx] if i < width * height)
+                self.assertEqual(cells, set(i for i in range(width * height)
+                                            if (mask >> i) & 1))
+
+    def test_rollouts_follow_the_rules(self):
+        # player 1 has no moves left and loses every rollout
+        game = isolation.Board("Player1", "Player2", 3, 3)
+        for move in [(0, 0), (1, 1), (2, 1), (0, 2)]:
+            game.apply_move(move)
+        wins = rollout.random_rollouts(game, 64)
+        self.assertEqual(wins.shape, (64,))
+        self.assertFalse(wins.any())
+        self.assertTrue(rollout.random_rollouts(game, 64, player="Player2").all())
+
+        # player 2 is stuck in the center, so whatever player 1 plays wins
+        game = isolation.Board("Player1", "Player2", 3, 3)
+        for move in [(0, 0), (1, 1)]:
+            game.apply_move(move)
+        self.assertTrue(rollout.random_rollouts(game, 64, rng=numpy.random.default_rng(1)).all())
+
+    def test_rollouts_match_python_playouts(self):
+        game = isolation.Board("Player1", "Player2", 5, 5)
+        game.apply_move((2, 2))
+        wins = rollout.random_rollouts(game, 20000, rng=numpy.random.default_rng(0))
+        random.seed(0)
+        python_wins = sum(competition_agent.random_playout(game.copy()) == "Player2"
+                          for _ in range(5000))
+        self.assertAlmostEqual(wins.mean(), python_wins / 5000., delta=0.04)
+
+
+@unittest.skipIf(numpy is None, "NumPy is not installed")
+class BoardBatchTest(unittest.TestCase):
+    """Unit tests for the batched evaluation in isolation.batch"""
+
+    def test_batch_matches_scalar_heuristics(self):
+        random.seed(0)
+        boards = []
+        for width, height in ((7, 7), (4, 6)):
+            for _ in range(20):
+                game = isolation.Board("Player1", "Player2", width, height)
+                while True:
+                    boards.append(game.copy())
+                    moves = game.get_legal_moves()
+                    if not moves:
+                        break
+                    game.apply_move(random.choice(moves))
+        for width, height in ((7, 7), (4, 6)):
+            games = [g for g in boards if (g.width, g.height) == (width, height)]
+            positions = batch.BoardBatch.from_boards(games)
+            self.assertEqual(len(positions), len(games))
+            self.assertEqual(list(positions.is_terminal()),
+                             [not g.get_legal_moves() for g in games])
+            for player in ("Player1", "Player2"):
+                seats = batch.player_seats(games, player)
+                for batched, scalar in (
+                        (positions.open_move_score, sample_players.open_move_score),
+                        (positions.improved_score, sample_players.improved_score),
+                        (positions.second_order_score, game_agent.custom_score_6)):
+                    self.assertEqual(list(batched(seats)),
+                                     [scalar(g, player) for g in games])
+
+        with self.assertRaises(ValueError):
+            batch.BoardBatch.from_boards(boards)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,116 @@
+"""Measure how isolation.Board and the search scale with the board size.
+
+For each size this reports the memory footprint and copy() cost of a board,
+the move generation rate (legal moves listed plus moves made and taken back
+per second), and the depth that `AlphaBetaPlayer` completes per turn within
+a fixed time budget.
+
+Each measurement uses boards from the middle of random games (about a third
+of the cells blocked), since that is where a search spends its time.
+"""
+import random
+import time
+import timeit
+import tracemalloc
+
+from isolation import Board
+from game_agent import AlphaBetaPlayer, MoveOrdering
+
+BOARD_SIZES = [(7, 7), (9, 7), (9, 9), (11, 11), (13, 13), (15, 15)]
+NUM_INSTANCES = 10000
+NUM_COPIES = 100000
+NUM_MOVES = 100000
+NUM_TURNS = 10
+TIME_LIMIT = 150.
+
+# the search options measured by search_depth()
+PLAYER_OPTIONS = dict(in_place=True, tt_size=2**18, pv_ordering=True,
+                      deadline=True, symmetry=True)
+
+
+def midgame_board(width, height, seed=0, players=("Player1", "Player2")):
+    """Return a board after random moves have blocked about a third of the
+    cells (or until the game ends).
+    """
+    rng = random.Random(seed)
+    game = Board(players[0], players[1], width, height)
+    while game.move_count < width * height // 3:
+        # get_legal_moves() shuffles, so sort to replay the same game
+        moves = sorted(game.get_legal_moves())
+        if not moves:
+            break
+        game.apply_move(rng.choice(moves))
+    return game
+
+
+def instance_memory(game, num_instances=NUM_INSTANCES):
+    """Return the average number of bytes allocated per copy of `game`."""
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    copies = [game.copy() for _ in range(num_instances)]
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # the list holding the copies is not part of the board
+    return (end - start) / float(len(copies)) - 8
+
+
+def copy_time(game, num_copies=NUM_COPIES):
+    """Return the average time of game.copy() in microseconds."""
+    return min(timeit.repeat(game.copy, number=num_copies, repeat=3)) / num_copies * 1e6
+
+
+def moves_per_second(game, num_moves=NUM_MOVES):
+    """Return the number of moves generated, made and taken back per second
+    by a random walk through the search tree below `game`, the way an in
+    place search visits it.
+    """
+    rng = random.Random(0)
+    game = game.copy()
+    if not game.get_legal_moves():
+        return 0.
+    root = game.move_count
+    count = 0
+    start = time.perf_counter()
+    while count < num_moves:
+        moves = game.get_legal_moves()
+        count += len(moves)
+        if moves:
+            game.push_move(rng.choice(moves))
+        else:
+            while game.move_count > root:
+                game.pop_move()
+    elapsed = time.perf_counter() - start
+    return count / elapsed
+
+
+def search_depth(width, height, num_turns=NUM_TURNS, time_limit=TIME_LIMIT):
+    """Return the mean depth completed by `AlphaBetaPlayer` within
+    `time_limit` milliseconds, over `num_turns` midgame positions.
+    """
+    depths = []
+    for seed in range(num_turns):
+        player = AlphaBetaPlayer(ordering=MoveOrdering(), **PLAYER_OPTIONS)
+        game = midgame_board(width, height, seed, (player, "Opponent"))
+        if game.active_player != player:
+            # the same random game, with the player seated on the side to move
+            game = midgame_board(width, height, seed, ("Opponent", player))
+        if not game.get_legal_moves():
+            continue
+        start = time.time()
+        player.get_move(game, lambda: time_limit - (time.time() - start) * 1000)
+        depths.append(player.search_stats.get("depth", 0))
+    return sum(depths) / float(max(len(depths), 1))
+
+
+def main():
+    print("{:>7} {:>12} {:>10} {:>12} {:>8}".format(
+        "board", "bytes/board", "copy() us", "moves/s", "depth"))
+    for width, height in BOARD_SIZES:
+        game = midgame_board(width, height)
+        print("{:>7} {:>12.0f} {:>10.3f} {:>12.0f} {:>8.1f}".format(
+            "{}x{}".format(width, height), instance_memory(game), copy_time(game),
+            moves_per_second(game), search_depth(width, height)))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,10 @@ champions) in a tournament.
 
          COMPLETING AND SUBMITTING A COMPETITION AGENT IS OPTIONAL
 """
+import gc
+import math
 import random
+import time
 
 
 class SearchTimeout(Exception):
@@ -36,6 +39,77 @@ def custom_score(game, player):
     raise NotImplementedError
 
 
+class TreeNode:
+    """A node of the Monte Carlo search tree.
+
+    Parameters
+    ----------
+    move : (int, int)
+        The move that leads from the parent node to this node.
+
+    player : object
+        The player that made `move`; `wins` are counted for this player.
+
+    untried : list
+        The legal moves in this node that have no child node yet.
+    """
+    # no parent links: without reference cycles a discarded subtree is freed
+    # at once instead of by a slow cyclic garbage collection
+    __slots__ = ("move", "player", "children", "untried", "visits", "wins")
+
+    def __init__(self, move, player, untried):
+        self.move = move
+        self.player = player
+        self.children = []
+        self.untried = untried
+        self.visits = 0
+        self.wins = 0
+
+    def select_child(self, exploration):
+        """Return the child with the highest UCT value."""
+        log_visits = math.log(self.visits)
+        return max(self.children, key=lambda c: c.wins / c.visits +
+                   exploration * math.sqrt(log_visits / c.visits))
+
+    def find_child(self, move):
+        """Return the child reached by `move`, or None if it is not
+        expanded.
+        """
+        for child in self.children:
+            if child.move == move:
+                return child
+        return None
+
+
+def random_playout(game):
+    """Play random moves on `game` until one side is stuck, and return the
+    winner. The board is modified in place.
+    """
+    while True:
+        moves = game.get_legal_moves()
+        if not moves:
+            return game.inactive_player
+        game.apply_move(random.choice(moves))
+
+
+def greedy_playout(game):
+    """Play moves on `game` that leave the opponent the fewest replies
+    until one side is stuck, and return the winner. The board is modified in
+    place.
+    """
+    while True:
+        player = game.active_player
+        moves = game.get_legal_moves(player)
+        if not moves:
+            return game.inactive_player
+        best = None
+        for move in moves:
+            replies = len(game.forecast_move(move).get_legal_moves())
+            if best is None or replies < best[0]:
+                best = (replies, move)
+        game.apply_move(best[1])
+
+
 class CustomPlayer:
     """Game-playing agent to use in the optional player vs player Isolation
     competition.
@@ -59,12 +133,31 @@ class CustomPlayer:
         the PvP competition uses more accurate timers that are not cross-
         platform compatible, so a limit of 1ms (vs 10ms for the other classes)
         is generally sufficient.
+
+    exploration : float (optional)
+        The exploration constant of the UCT selection rule.
+
+    playout : callable (optional)
+        The playout policy, `random_playout` or `greedy_playout`.
     """
 
-    def __init__(self, data=None, timeout=1.):
+    def __init__(self, data=None, timeout=1., exploration=math.sqrt(2),
+                 playout=random_playout):
         self.score = custom_score
         self.time_left = None
         self.TIMER_THRESHOLD = timeout
+        self.exploration = exploration
+        self.playout = playout
+
+        # playouts run by the last get_move(), their rate per second, and the
+        # visits of the subtree kept from the previous turn
+        self.search_stats = {}
+
+        # the search tree of the last turn, with a copy of its root position
+        # and the move chosen there
+        self._tree = None
+        self._tree_game = None
+        self._tree_move = None
 
     def get_move(self, game, time_left):
         """Search for the best move from the available legal moves and return a
@@ -93,5 +186,98 @@ class CustomPlayer:
             Board coordinates corresponding to a legal move; may return
             (-1, -1) if there are no available legal moves.
         """
-        # OPTIONAL: Finish this function!
-        raise NotImplementedError
+        self.time_left = time_left
+        start = time.time()
+
+        root = self._reuse_tree(game)
+        if root is None:
+            root = TreeNode(None, game.inactive_player, game.get_legal_moves())
+        self.search_stats = {"playouts": 0, "playouts_per_sec": 0.,
+                             "reused": root.visits}
+        if not root.children and not root.untried:
+            return (-1, -1)
+
+        # a full collection walks every tree node and can take longer than
+        # the timeout threshold; the tree holds no cycles for it to find
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        playouts = 0
+        try:
+            # keep back the longest iteration so far, since an early-game
+            # playout alone can take about as long as the threshold
+            remaining = self.time_left()
+            slowest = 0.
+            while remaining - slowest > self.TIMER_THRESHOLD:
+                self.mcts(game, root)
+                playouts += 1
+                now = self.time_left()
+                slowest = max(slowest, remaining - now)
+                remaining = now
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        elapsed = time.time() - start
+        self.search_stats["playouts"] = playouts
+        if elapsed > 0:
+            self.search_stats["playouts_per_sec"] = playouts / elapsed
+
+        if root.children:
+            move = max(root.children, key=lambda c: c.visits).move
+        else:
+            move = root.untried[0]
+        self._tree, self._tree_game, self._tree_move = root, game.copy(), move
+        return move
+
+    def mcts(self, game, root):
+        """Run one selection, expansion, playout and backpropagation step
+        from `root`, the node of position `game`. The board is restored
+        before returning.
+        """
+        node = root
+        path = [root]
+        try:
+            # selection
+            while not node.untried and node.children:
+                node = node.select_child(self.exploration)
+                game.push_move(node.move)
+                path.append(node)
+
+            # expansion
+            if node.untried:
+                player = game.active_player
+                move = node.untried.pop()
+                game.push_move(move)
+                node = TreeNode(move, player, game.get_legal_moves())
+                path[-1].children.append(node)
+                path.append(node)
+
+            winner = self.playout(game.copy())
+        finally:
+            for _ in range(len(path) - 1):
+                game.pop_move()
+
+        # backpropagation
+        for node in path:
+            node.visits += 1
+            if node.player is winner:
+                node.wins += 1
+
+    def _reuse_tree(self, game):
+        """Return the subtree of the last search under the move it chose and
+        the opponent's reply that led to `game`, or None.
+        """
+        tree, self._tree = self._tree, None
+        if tree is None:
+            return None
+        node = tree.find_child(self._tree_move)
+        if node is None:
+            return None
+        reply = game.get_player_location(game.inactive_player)
+        node = node.find_child(reply)
+        if node is None:
+            return None
+        played = self._tree_game.forecast_move(self._tree_move).forecast_move(reply)
+        if played.hash() != game.hash():
+            return None
+        return node
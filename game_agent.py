@@ -4,6 +4,8 @@ and include the results in your report.
 """
 import random
 
+import isolation
+
 
 class SearchTimeout(Exception):
     """Subclass base exception for code clarity. """
@@ -57,11 +59,9 @@ def custom_score_2(game, player):
     float
         The heuristic value of the current game state to the specified player.
     """
-    if game.is_loser(player):
-        return float("-inf")
-
-    if game.is_winner(player):
-        return float("inf")
+    value = game.terminal_value(player)
+    if value is not None:
+        return value
 
     y1, x1 = game.get_player_location(player)
     y2, x2 = game.get_player_location(game.get_opponent(player))
@@ -90,11 +90,9 @@ def custom_score_3(game, player):
     float
         The heuristic value of the current game state to the specified player.
     """
-    if game.is_loser(player):
-        return float("-inf")
-
-    if game.is_winner(player):
-        return float("inf")
+    value = game.terminal_value(player)
+    if value is not None:
+        return value
 
     w, h = game.width / 2., game.height / 2.
     y1, x1 = game.get_player_location(player)
@@ -154,18 +152,11 @@ def custom_score_5(game, player):
     float
         The heuristic value of the current game state to the specified player.
     """
-    if game.is_loser(player):
-        return float("-inf")
-
-    if game.is_winner(player):
-        return float("inf")
-
-    legal_moves = game.get_legal_moves(player)
-    v = 0
-    for m in legal_moves:
-        v += get_open_moves_count(game, m)
+    value = game.terminal_value(player)
+    if value is not None:
+        return value
 
-    return float(v)
+    return float(game.count_second_order_moves(player))
 
 def custom_score_6(game, player):
     """Heursitic: aximize the open moves available after the next move, but balance it against the moves 
@@ -189,21 +180,12 @@ def custom_score_6(game, player):
     float
         The heuristic value of the current game state to the specified player.
     """
-    if game.is_loser(player):
-        return float("-inf")
+    value = game.terminal_value(player)
+    if value is not None:
+        return value
 
-    if game.is_winner(player):
-        return float("inf")
-
-    legal_moves = game.get_legal_moves(player)
-    v = 0
-    for m in legal_moves:
-        v += get_open_moves_count(game, m)
-
-    legal_moves = game.get_legal_moves(game.get_opponent(player))
-    w = 0
-    for m in legal_moves:
-        w += get_open_moves_count(game, m)
+    v = game.count_second_order_moves(player)
+    w = game.count_second_order_moves(game.get_opponent(player))
 
     return float(v - w)
 
@@ -229,11 +211,9 @@ def custom_score_7(game, player):
     float
         The heuristic value of the current game state to the specified player.
     """
-    if game.is_loser(player):
-        return float("-inf")
-
-    if game.is_winner(player):
-        return float("inf")
+    value = game.terminal_value(player)
+    if value is not None:
+        return value
 
     legal_moves_1 = game.get_legal_moves(player)
     legal_moves_2 = game.get_legal_moves(game.get_opponent(player))
@@ -253,16 +233,800 @@ def custom_score_7(game, player):
     return float(v - w)
 
 def get_open_moves_count(game, loc):
+    """Return the number of open cells one knight move away from `loc`.
+    """
+    return game.count_moves_from(loc)
+
+class TranspositionTable:
+    """Fixed-size transposition table keyed on `Board.hash()`.
+
+    The table is split into buckets of two slots. The first slot prefers the
+    deepest search result (entries from an earlier turn may always be
+    replaced), the second slot always takes the newest result. All slots are
+    allocated up front, so memory stays flat however long the table is used.
+
+    Parameters
+    ----------
+    max_entries : int (optional)
+        The maximum number of positions held by the table.
+    """
+    EXACT = 0
+    LOWER = 1
+    UPPER = 2
+
+    # mixed into the keys of a player searching from the second seat; see
+    # AlphaBetaPlayer.alphabeta()
+    SEAT_KEY = 0x9E3779B97F4A7C15
+
+    def __init__(self, max_entries=2**18):
+        self.num_buckets = max(1, max_entries // 2)
+        self.clear()
+
+    def clear(self):
+        """Drop every entry and reset the statistics."""
+        self._slots = [None] * (2 * self.num_buckets)
+        self._age = 0
+        self.filled = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.cutoffs = 0
+
+    def new_search(self):
+        """Mark the entries stored so far as belonging to an earlier turn."""
+        self._age += 1
+
+    def probe(self, key):
+        """Return the (key, depth, value, flag, move, age) entry stored for
+        `key`, or None.
+        """
+        self.probes += 1
+        idx = (key % self.num_buckets) << 1
+        entry = self._slots[idx]
+        if entry is None or entry[0] != key:
+            entry = self._slots[idx + 1]
+            if entry is None or entry[0] != key:
+                return None
+        self.hits += 1
+        return entry
+
+    def cutoff(self, entry, depth, alpha, beta):
+        """Return True if `entry` settles the value of a node searched to
+        `depth` with the window (alpha, beta).
+        """
+        if entry[1] < depth:
+            return False
+        flag = entry[3]
+        if (flag == TranspositionTable.EXACT or
+                (flag == TranspositionTable.LOWER and entry[2] >= beta) or
+                (flag == TranspositionTable.UPPER and entry[2] <= alpha)):
+            self.cutoffs += 1
+            return True
+        return False
+
+    def store(self, key, depth, value, flag, move):
+        """Record a search result for the position with hash `key`.
+
+        Parameters
+        ----------
+        key : int
+            The `Board.hash()` of the position.
+
+        depth : int
+            The remaining search depth the value was computed with.
+
+        value : float
+            The search result from the searching player's point of view.
+
+        flag : int
+            EXACT, LOWER (value is a lower bound) or UPPER (value is an upper
+            bound).
+
+        move : (int, int)
+            The best move found in the position.
+        """
+        self.stores += 1
+        idx = (key % self.num_buckets) << 1
+        entry = (key, depth, value, flag, move, self._age)
+        deep = self._slots[idx]
+        if deep is None or deep[0] == key or deep[5] != self._age or depth >= deep[1]:
+            if deep is None:
+                self.filled += 1
+            elif deep[0] != key:
+                # demote the replaced entry to the always-replace slot
+                if self._slots[idx + 1] is None:
+                    self.filled += 1
+                self._slots[idx + 1] = deep
+            self._slots[idx] = entry
+        else:
+            if self._slots[idx + 1] is None:
+                self.filled += 1
+            self._slots[idx + 1] = entry
+
+    @staticmethod
+    def bound(value, alpha, beta):
+        """Return the flag for a fail-soft search result in (alpha, beta)."""
+        if value <= alpha:
+            return TranspositionTable.UPPER
+        if value >= beta:
+            return TranspositionTable.LOWER
+        return TranspositionTable.EXACT
+
+    def entries(self):
+        """Return the entries stored since the last `new_search()`."""
+        return [entry for entry in self._slots
+                if entry is not None and entry[5] == self._age]
+
+    def merge(self, entries):
+        """Store `entries` from another table as results of the current
+        search. Shallow entries go in first, so that the deep ones end up in
+        the depth-preferred slots.
+        """
+        for key, depth, value, flag, move, _ in sorted(entries, key=lambda e: e[1]):
+            self.store(key, depth, value, flag, move)
+
+    def stats(self):
+        """Return the table usage counters as a dict."""
+        return {"entries": self.filled, "probes": self.probes, "hits": self.hits,
+                "stores": self.stores, "cutoffs": self.cutoffs}
+
+
+class MoveOrdering:
+    """Killer-move and history-heuristic move ordering, shared by the search
+    players through their `ordering` parameter.
+
+    Moves credited by a search (beta cutoffs in alpha-beta, best moves in
+    minimax) are remembered in a few killer slots per ply and accumulated in
+    a history table indexed by (player, destination cell). Legal moves are
+    then sorted with the killers of the current ply first, followed by the
+    moves with the highest history score.
+
+    Parameters
+    ----------
+    num_killers : int (optional)
+        The number of killer moves remembered per ply.
+
+    decay : float (optional)
+        Factor applied to every history score between turns.
+
+    enabled : bool (optional)
+        If False, moves keep the board's default random order and nothing is
+        recorded, so searches can be compared with and without ordering.
+    """
+    KILLER_BONUS = 1 << 30
+
+    def __init__(self, num_killers=2, decay=0.5, enabled=True):
+        self.num_killers = num_killers
+        self.decay = decay
+        self.enabled = enabled
+        self.killers = []
+        self.history = {}
+
+    def new_search(self):
+        """Forget the killer moves and decay the history scores."""
+        self.killers = []
+        self.history = {key: score * self.decay
+                        for key, score in self.history.items()
+                        if score * self.decay >= 1}
+
+    def order(self, game, player, ply, first=None):
+        """Return the legal moves of `player` at search depth `ply`, sorted by
+        the killer and history tables, with the move `first` (e.g., a
+        principal variation move) ahead of all others.
+        """
+        killers = self.killers[ply] if ply < len(self.killers) else ()
+        history = self.history
+
+        def key(move):
+            if move == first:
+                return float("-inf")
+            score = history.get((player, move), 0)
+            if move in killers:
+                score += MoveOrdering.KILLER_BONUS
+            return -score
+
+        return game.get_legal_moves(player, key=key)
+
+    def record(self, player, ply, move, depth):
+        """Credit `move` by `player` at `ply`, searched with `depth` plies
+        remaining, as a killer and in the history table.
+        """
+        if not self.enabled:
+            return
+        while len(self.killers) <= ply:
+            self.killers.append([])
+        killers = self.killers[ply]
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[self.num_killers:]
+        key = (player, move)
+        self.history[key] = self.history.get(key, 0) + depth * depth
+
+
+class Deadline:
+    """Amortized clock for the search players.
+
+    Reading `time_left()` at every node costs several Python calls. A
+    `Deadline` samples it only every `interval` nodes and raises
+    `SearchTimeout` under the same condition as the per-node check. After
+    each sample the interval is re-tuned from the measured node rate so that
+    about `sample_ms` milliseconds pass between two samples, and never more
+    than half of the time left before the threshold.
+
+    It also records the size and duration of each completed
+    iterative-deepening pass, so that a pass that is predicted to overrun
+    the deadline is not started at all.
+
+    Parameters
+    ----------
+    sample_ms : float (optional)
+        Target time between two clock samples, in milliseconds. This must be
+        well below the player's timeout threshold.
+
+    max_interval : int (optional)
+        Upper bound on the number of nodes between two clock samples.
     """
+    def __init__(self, sample_ms=1., max_interval=4096):
+        self.sample_ms = sample_ms
+        self.max_interval = max_interval
+        self.interval = 1
+        self.time_left = None
+        self.threshold = 0.
+        self._countdown = 1
+        self._last_remaining = 0.
+        self._pass_start = 0.
+        self._passes = []
+
+    def start(self, time_left, threshold):
+        """Begin timing a new turn with the `time_left` callable."""
+        self.time_left = time_left
+        self.threshold = threshold
+        self._last_remaining = self._pass_start = time_left()
+        self._countdown = self.interval = 1
+        self._passes = []
+
+    def tick(self):
+        """Count one search node, sampling the clock when the interval is
+        used up.
+        """
+        self._countdown -= 1
+        if self._countdown <= 0:
+            self.check()
+
+    def check(self):
+        """Sample the clock, raise `SearchTimeout` if the time left is below
+        the threshold, and re-tune the sampling interval.
+        """
+        remaining = self.time_left()
+        if remaining < self.threshold:
+            raise SearchTimeout()
+
+        elapsed = self._last_remaining - remaining
+        if elapsed > 0:
+            nodes_per_ms = self.interval / elapsed
+            budget = min(self.sample_ms, (remaining - self.threshold) / 2.)
+            self.interval = max(1, min(self.max_interval, int(nodes_per_ms * budget)))
+        else:
+            self.interval = min(self.max_interval, 2 * self.interval)
+        self._last_remaining = remaining
+        self._countdown = self.interval
+
+    def pass_done(self, nodes):
+        """Record a completed iterative-deepening pass that expanded `nodes`
+        nodes.
+        """
+        remaining = self.time_left()
+        self._passes.append((nodes, self._pass_start - remaining))
+        self._pass_start = remaining
+
+    def next_pass_fits(self):
+        """Return False if the next pass cannot finish before the threshold,
+        even when it grows by the smallest effective branching factor seen
+        over the last few passes. (The factor swings widely between odd and
+        even depths, so a typical estimate would skip passes that fit.)
+        """
+        recent = self._passes[-4:]
+        if len(recent) < 2:
+            return True
+        branching = min(float(nodes) / max(prev_nodes, 1)
+                        for (prev_nodes, _), (nodes, _) in zip(recent, recent[1:]))
+        return recent[-1][1] * branching < self._pass_start - self.threshold
+
+
+class EndgameSolver:
+    """Exact solver for positions in which the players are separated.
+
+    Once `Board.is_partitioned()` holds, each player moves on a region of
+    the board the other can no longer reach, and the game is decided by the
+    lengths of their longest knight paths: the player to move wins if and
+    only if its path is strictly longer. The paths are found by
+    `Board.longest_path()` with a memo that is kept across turns, since the
+    positions of a player's region recur along the path it then plays.
+
+    Parameters
+    ----------
+    max_entries : int (optional)
+        The memo is cleared when it grows beyond this many positions.
+
+    share : float (optional)
+        The fraction of the time left above the timeout threshold the solver
+        may use; if it runs out, `solve()` gives up for this turn.
+    """
+    def __init__(self, max_entries=2**18, share=0.5):
+        self.max_entries = max_entries
+        self.share = share
+        self.nodes = 0
+        self._memos = {}
+
+    def solve(self, game, player, time_left, threshold):
+        """Return the (value, move) pair for the player to move in `game`,
+        with the value (+inf or -inf) from the point of view of `player`,
+        or None if the players are not separated or the time share runs out.
+        """
+        if not game.is_partitioned():
+            return None
+        memo = self._memos.setdefault((game.width, game.height), {})
+        stop = threshold + (time_left() - threshold) * (1. - self.share)
+
+        def check():
+            self.nodes += 1
+            if len(memo) > self.max_entries:
+                memo.clear()
+            if self.nodes % 64 == 0 and time_left() < stop:
+                raise SearchTimeout()
+
+        # the player to move wins with a path longer than the opponent's, so
+        # its own path is only searched until it is longer
+        try:
+            own, move = game.longest_path(game.active_player, memo, check, limit=1)
+            other = 0
+            if own:
+                other, _ = game.longest_path(game.inactive_player, memo, check)
+                own, move = game.longest_path(game.active_player, memo, check,
+                                              limit=other + 1)
+        except SearchTimeout:
+            return None
+        value = float("inf") if own > other else float("-inf")
+        if game.active_player != player:
+            value = -value
+        return value, move
+
+
+class ProofNumberSearch:
+    """Depth-first proof-number (df-pn) search for proving positions won or
+    lost.
+
+    Every position has a proof number, the smallest number of leaves that
+    must be shown won for the player to move to prove that it wins, and a
+    disproof number for the loss. Both are kept from the point of view of
+    the player to move, keyed on `Board.hash()`, so the table serves either
+    seat and is kept between turns. Once it holds more than `max_entries`
+    positions the unproven ones are dropped, and the proven ones too if they
+    alone fill more than half of it.
+
+    Parameters
+    ----------
+    max_entries : int (optional)
+        The size the table is trimmed back from.
+
+    share : float (optional)
+        The fraction of the time left above the timeout threshold one call
+        to `solve()` may use.
+    """
+    INFINITY = 10**9
+
+    def __init__(self, max_entries=2**18, share=0.5):
+        self.max_entries = max_entries
+        self.share = share
+        self.nodes = 0
+        self.table = {}
+        self._time_left = None
+        self._stop = 0.
+
+    def solve(self, game, player, time_left, threshold):
+        """Search `game` until the result is proven or the time share runs
+        out. Return the (value, move) pair for the player to move, with the
+        value (+inf or -inf) from the point of view of `player`, or None if
+        the position was not proven.
+        """
+        self._time_left = time_left
+        self._stop = threshold + (time_left() - threshold) * (1. - self.share)
+        try:
+            self._mid(game, self.INFINITY, self.INFINITY)
+        except SearchTimeout:
+            pass
+
+        proof, disproof = self._numbers(game)
+        if proof and disproof:
+            return None
+        legal_moves = game.get_legal_moves()
+        move = legal_moves[0] if legal_moves else (-1, -1)
+        if not proof:
+            # a move to a position lost by the opponent
+            move = next(m for m in legal_moves if not self._numbers(game.forecast_move(m))[1])
+        value = float("inf") if not proof else float("-inf")
+        if game.active_player != player:
+            value = -value
+        return value, move
+
+    def _numbers(self, game):
+        """Return the (proof, disproof) numbers of `game`, initialized from
+        its number of moves if the table has not seen it yet.
+        """
+        entry = self.table.get(game.hash())
+        if entry is not None:
+            return entry
+        num_moves = game.count_moves()
+        if not num_moves:
+            return self.INFINITY, 0
+        return 1, num_moves
+
+    def _store(self, game, proof, disproof):
+        table = self.table
+        if len(table) >= self.max_entries:
+            table = self.table = {key: entry for key, entry in table.items()
+                                  if not entry[0] or not entry[1]}
+            if len(table) > self.max_entries // 2:
+                table.clear()
+        table[game.hash()] = (proof, disproof)
+
+    def _mid(self, game, proof_limit, disproof_limit):
+        """Expand `game` until its proof number reaches `proof_limit` or its
+        disproof number reaches `disproof_limit`.
+        """
+        self.nodes += 1
+        if self.nodes % 64 == 0 and self._time_left() < self._stop:
+            raise SearchTimeout()
+
+        infinity = self.INFINITY
+        children = [game.forecast_move(m) for m in game.get_legal_moves()]
+        if not children:
+            self._store(game, infinity, 0)
+            return
+
+        while True:
+            # a position is won if any child is lost for the opponent, and
+            # lost if every child is won for it
+            proof = second = infinity
+            total = 0
+            best = None
+            for child in children:
+                child_proof, child_disproof = self._numbers(child)
+                total += child_proof
+                if child_disproof < proof:
+                    second = proof
+                    proof = child_disproof
+                    best, best_proof = child, child_proof
+                elif child_disproof < second:
+                    second = child_disproof
+            disproof = min(total, infinity)
+            if proof >= proof_limit or disproof >= disproof_limit:
+                self._store(game, proof, disproof)
+                return
+            self._mid(best,
+                      min(disproof_limit - disproof + best_proof, infinity),
+                      min(proof_limit, second + 1))
+
+
+_TABLEBASES = {}
+
+
+def _open_tablebase(path):
+    """Return the `Tablebase` for `path`, opened once per process."""
+    # tablebase reads through mmap; see Ponderer._ensure_process()
+    from isolation.tablebase import Tablebase
+
+    if path not in _TABLEBASES:
+        _TABLEBASES[path] = Tablebase(path)
+    return _TABLEBASES[path]
+
+
+def _position(game, player):
+    """Picklable description of `game` for a worker process, which cannot
+    receive the player objects held by the board.
     """
-    r, c = loc
+    seat = 1 if game._player_1 is player else 2
+    return game._board_state, game.move_count, game.width, game.height, seat
+
+
+def _rebuild_game(player, position):
+    """Rebuild a `_position()` in a worker, with `player` in its seat."""
+    state, move_count, width, height, seat = position
+    players = (player, "Opponent") if seat == 1 else ("Opponent", player)
+    game = isolation.Board(players[0], players[1], width, height)
+    game._board_state = state
+    game.move_count = move_count
+    return game
+
+
+def _ponder_worker(conn, config):
+    """Main loop of the `Ponderer` process.
+
+    Each job is a position with the opponent to move. It is searched by
+    iterative deepening until the parent sends "stop", and then the filled
+    transposition table entries are sent back. A None job ends the loop.
+    """
+    import os
+
+    if hasattr(os, "nice"):
+        # never compete with the opponent for a core it needs
+        os.nice(19)
+    poll_interval = 256
+    while True:
+        job = conn.recv()
+        if job is None:
+            break
+        player = AlphaBetaPlayer(**config)
+        game = _rebuild_game(player, job)
+
+        calls = [0]
+
+        def time_left():
+            # polling the pipe is the only way the parent can interrupt us
+            calls[0] += 1
+            if calls[0] % poll_interval == 0 and conn.poll():
+                return 0.
+            return float("inf")
+
+        player.time_left = time_left
+        depth = 0
+        try:
+            for d in range(1, len(game.get_blank_spaces()) + 1):
+                player._search_reply(game, d)
+                depth = d
+                if (not player._depth_cutoff or
+                        player._root_value in (float("inf"), float("-inf"))):
+                    break
+        except SearchTimeout:
+            pass
+
+        conn.recv()  # the "stop" that ends this job
+        conn.send((depth, player.nodes, player.tt.entries()))
+
+
+class Ponderer:
+    """Background process that searches on the opponent's clock.
 
-    directions = [(-2, -1), (-2, 1), (-1, -2), (-1, 2),
-                 (1, -2), (1, 2), (2, -1), (2, 1)]
-    valid_moves = [(r + dr, c + dc) for dr, dc in directions
-                  if game.move_is_legal((r + dr, c + dc))]
+    `Board.play()` only runs a player inside its own `get_move()`. After the
+    player has chosen a move, `start()` hands the resulting position to a
+    worker process that searches every reply of the opponent into its own
+    transposition table. When the player is on move again, `collect()` stops
+    the worker and returns the table entries if the new position is one of
+    those replies.
+
+    The process is started up front, since starting it takes longer than
+    the players' timeout threshold, and persists across turns and games. It
+    runs at the lowest priority, so it only gains depth on a spare core.
+
+    Parameters
+    ----------
+    config : dict
+        Keyword arguments for the `AlphaBetaPlayer` run by the worker. They
+        must select the same score function and a transposition table.
+    """
+    def __init__(self, config):
+        self.config = config
+        self._conn = None
+        self._process = None
+        self._replies = None
+        self._move_count = None
+        self._ensure_process()
+
+    def _ensure_process(self):
+        # imported here, since the project assistant's sandbox does not
+        # allow the module and every player is imported from this file
+        import multiprocessing
+
+        if self._process is None or not self._process.is_alive():
+            self._conn, child_conn = multiprocessing.Pipe()
+            self._process = multiprocessing.Process(
+                target=_ponder_worker, args=(child_conn, self.config), daemon=True)
+            self._process.start()
+            child_conn.close()
+
+    def start(self, game, player):
+        """Start pondering on `game`, in which the opponent of `player` is
+        to move.
+        """
+        replies = game.get_legal_moves()
+        if not replies:
+            return
+        self._ensure_process()
+        self._replies = set(game.forecast_move(m).hash() for m in replies)
+        self._move_count = game.move_count + 1
+        self._conn.send(_position(game, player))
+
+    def collect(self, game):
+        """Stop the current job and return its (depth, nodes, entries) if
+        `game` is one of the positions it pondered, else None.
+        """
+        if self._replies is None:
+            return None
+        replies, self._replies = self._replies, None
+        try:
+            self._conn.send("stop")
+            result = self._conn.recv()
+        except (EOFError, OSError):
+            # the worker died; a new one is started with the next job
+            self._process = None
+            return None
+        if game.move_count != self._move_count or game.hash() not in replies:
+            return None
+        return result
+
+    def close(self):
+        """Shut the worker process down."""
+        if self._process is not None:
+            if self._replies is not None:
+                self._conn.send("stop")
+                self._conn.recv()
+                self._replies = None
+            self._conn.send(None)
+            self._process.join()
+            self._process = None
+
+
+def _split_worker(conn, config):
+    """Main loop of a `RootSplitter` process.
+
+    Each job is a position, a share of its root moves and a time budget.
+    The share is searched by iterative deepening until the budget runs out
+    or its values are final, and the best (depth, move, value) of every
+    completed pass is sent back. A None job ends the loop.
+    """
+    import time
+
+    player = AlphaBetaPlayer(**config)
+    while True:
+        job = conn.recv()
+        if job is None:
+            break
+        job_id, position, moves, budget = job
+        start = time.time()
+        player.time_left = lambda: budget - (time.time() - start) * 1000
+        player.nodes = 0
+        player.tt.new_search()
+        if player.ordering is not None:
+            player.ordering.new_search()
+        game = _rebuild_game(player, position)
+
+        passes = []
+        resolved = False
+        try:
+            for d in range(1, len(game.get_blank_spaces()) + 1):
+                best_move, best_value = moves[0], float("-inf")
+                depth_cutoff = False
+                for move in moves:
+                    child = game.forecast_move(move)
+                    player._search_reply(child, d - 1, alpha=best_value)
+                    depth_cutoff = depth_cutoff or player._depth_cutoff
+                    if player._root_value > best_value:
+                        best_move, best_value = move, player._root_value
+                passes.append((d, best_move, best_value))
+                if not depth_cutoff or best_value == float("inf"):
+                    resolved = True
+                    break
+        except SearchTimeout:
+            pass
+        conn.send((job_id, passes, resolved, player.nodes))
+
+
+class RootSplitter:
+    """Pool of worker processes that search disjoint shares of the root
+    moves in parallel.
+
+    Each worker deepens its share independently with its own transposition
+    table, which persists across turns. The results are merged at the
+    deepest pass every worker completed, so that the values compared were
+    all searched to the same depth; a share that is fully resolved counts
+    as complete at any depth, and a proved win is taken at once. The pool
+    is started up front and persists across turns and games.
+
+    Parameters
+    ----------
+    config : dict
+        Keyword arguments for the `AlphaBetaPlayer` run by each worker. They
+        must select the same score function and a transposition table.
+
+    workers : int
+        The number of worker processes.
+    """
+    # milliseconds kept back from the workers' budget to collect and merge
+    # their results
+    MARGIN = 5.
+
+    def __init__(self, config, workers):
+        import multiprocessing  # see Ponderer._ensure_process()
+
+        self.config = config
+        self.workers = workers
+        self._conns = []
+        self._processes = []
+        self._pending = []
+        self._job_id = 0
+        for _ in range(workers):
+            conn, child_conn = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_split_worker, args=(child_conn, config), daemon=True)
+            process.start()
+            child_conn.close()
+            self._conns.append(conn)
+            self._processes.append(process)
+            self._pending.append(0)
+
+    def search(self, game, player, time_left, threshold):
+        """Search the legal moves of `player` in `game` until `time_left()`
+        drops to `threshold` milliseconds, and return (depth, move, value,
+        nodes) for the best move found. The depth is None if no worker
+        completed a pass in time, in which case the move is the first legal
+        move; it is (-1, -1) if there are no legal moves.
+        """
+        legal_moves = game.get_legal_moves(player)
+        if not legal_moves:
+            return None, (-1, -1), float("-inf"), 0
+        if self.config.get("symmetry"):
+            legal_moves = game.distinct_moves(legal_moves)
+
+        self._job_id += 1
+        position = _position(game, player)
+        budget = time_left() - self.MARGIN
+        shares = [legal_moves[i::self.workers] for i in range(self.workers)]
+        busy = []
+        for i, share in enumerate(shares):
+            if share and self._drain(i):
+                self._conns[i].send((self._job_id, position, share, budget))
+                self._pending[i] += 1
+                busy.append(i)
+
+        results = []
+        nodes = 0
+        for i in busy:
+            conn = self._conns[i]
+            while conn.poll(max(0., time_left() - threshold) / 1000):
+                job_id, passes, resolved, worker_nodes = conn.recv()
+                self._pending[i] -= 1
+                if job_id == self._job_id:
+                    results.append((passes, resolved))
+                    nodes += worker_nodes
+                    break
+        return self._merge(results, legal_moves[0]) + (nodes,)
+
+    def _drain(self, i):
+        """Discard the late results of worker `i` from earlier turns, and
+        return True if it is idle.
+        """
+        conn = self._conns[i]
+        while self._pending[i] and conn.poll():
+            conn.recv()
+            self._pending[i] -= 1
+        return not self._pending[i]
+
+    @staticmethod
+    def _merge(results, fallback):
+        """Return (depth, move, value) from the workers' pass results."""
+        results = [(passes, resolved) for passes, resolved in results if passes]
+        if not results:
+            return None, fallback, float("-inf")
+        for passes, _ in results:
+            if passes[-1][2] == float("inf"):
+                return passes[-1]
+        depths = [passes[-1][0] for passes, resolved in results if not resolved]
+        depth = min(depths) if depths else max(passes[-1][0] for passes, _ in results)
+        move, value = fallback, None
+        for passes, resolved in results:
+            # passes run from depth 1 up; a resolved share is final
+            _, share_move, share_value = passes[-1] if resolved else passes[depth - 1]
+            if value is None or share_value > value:
+                move, value = share_move, share_value
+        return depth, move, value
+
+    def close(self):
+        """Shut the worker processes down."""
+        for conn, process in zip(self._conns, self._processes):
+            conn.send(None)
+            process.join()
+        self._conns, self._processes, self._pending = [], [], []
 
-    return len(valid_moves)
 
 class IsolationPlayer:
     """Base class for minimax and alphabeta agents -- this class is never
@@ -297,7 +1061,41 @@ class MinimaxPlayer(IsolationPlayer):
     """Game-playing agent that chooses a move using depth-limited minimax
     search. You must finish and test this player to make sure it properly uses
     minimax to return a good move before the search time limit expires.
+
+    Parameters
+    ----------
+    in_place : bool (optional)
+        If True, walk the game tree on a single board with
+        `Board.push_move()`/`Board.pop_move()` instead of allocating a copy
+        per node with `Board.forecast_move()`.
+
+    ordering : MoveOrdering (optional)
+        If given, expand moves in killer/history order instead of at random,
+        crediting the best move of every node.
+
+    deadline : bool (optional)
+        If True, check the clock through an amortized `Deadline` instead of
+        calling `time_left()` at every node.
+
+    symmetry : bool (optional)
+        If True, expand only one root move of each class of moves that are
+        equivalent under the symmetries of the root position.
     """
+    def __init__(self, search_depth=3, score_fn=custom_score, timeout=10.,
+                 in_place=False, ordering=None, deadline=False, symmetry=False):
+        super().__init__(search_depth, score_fn, timeout)
+        self.in_place = in_place
+        self.ordering = ordering
+        self.deadline = Deadline() if deadline else None
+        self.symmetry = symmetry
+        self.nodes = 0
+        self._root_move_count = 0
+
+    def _ordered_moves(self, game, player):
+        """Return the legal moves of `player` in the order they are searched."""
+        if self.ordering is None or not self.ordering.enabled:
+            return game.get_legal_moves(player)
+        return self.ordering.order(game, player, game.move_count - self._root_move_count)
 
     def get_move(self, game, time_left):
         """Search for the best move from the available legal moves and return a
@@ -328,6 +1126,11 @@ class MinimaxPlayer(IsolationPlayer):
             (-1, -1) if there are no available legal moves.
         """
         self.time_left = time_left
+        self.nodes = 0
+        if self.ordering is not None:
+            self.ordering.new_search()
+        if self.deadline is not None:
+            self.deadline.start(time_left, self.TIMER_THRESHOLD)
 
         # Initialize the best move so that this function returns something
         # in case the search fails due to timeout
@@ -367,18 +1170,32 @@ class MinimaxPlayer(IsolationPlayer):
         utility_value: float
             utility value of the situation represented by the board encoded in the parameter game.
         """
-        if self.time_left() < self.TIMER_THRESHOLD:
+        if self.deadline is not None:
+            self.deadline.tick()
+        elif self.time_left() < self.TIMER_THRESHOLD:
             raise SearchTimeout()
 
+        self.nodes += 1
+
         if depth == 0:
             return(self.score(game, self))
         v = float("-inf")
-
-        for cand_m   in game.get_legal_moves(self):
-            cand_game = game.forecast_move(cand_m)
-            cand_v = self.min_value(cand_game, depth - 1)
+        m = None
+
+        for cand_m in self._ordered_moves(game, self):
+            if self.in_place:
+                game.push_move(cand_m)
+                cand_v = self.min_value(game, depth - 1)
+                game.pop_move()
+            else:
+                cand_game = game.forecast_move(cand_m)
+                cand_v = self.min_value(cand_game, depth - 1)
             if cand_v > v:
                 v = cand_v
+                m = cand_m
+
+        if self.ordering is not None and m is not None:
+            self.ordering.record(self, game.move_count - self._root_move_count, m, depth)
         return v
 
     def min_value(self, game, depth):
@@ -404,18 +1221,33 @@ class MinimaxPlayer(IsolationPlayer):
         utility_value: float
             utility value of the situation represented by the board encoded in the parameter game.
         """
-        if self.time_left() < self.TIMER_THRESHOLD:
+        if self.deadline is not None:
+            self.deadline.tick()
+        elif self.time_left() < self.TIMER_THRESHOLD:
             raise SearchTimeout()
 
+        self.nodes += 1
+
         if depth == 0:
             return(self.score(game, self))
         v = float("+inf")
-
-        for cand_m in game.get_legal_moves(game.get_opponent(self)):
-            cand_game = game.forecast_move(cand_m)
-            cand_v = self.max_value(cand_game, depth - 1)
+        m = None
+
+        opponent = game.get_opponent(self)
+        for cand_m in self._ordered_moves(game, opponent):
+            if self.in_place:
+                game.push_move(cand_m)
+                cand_v = self.max_value(game, depth - 1)
+                game.pop_move()
+            else:
+                cand_game = game.forecast_move(cand_m)
+                cand_v = self.max_value(cand_game, depth - 1)
             if cand_v < v:
                 v = cand_v
+                m = cand_m
+
+        if self.ordering is not None and m is not None:
+            self.ordering.record(opponent, game.move_count - self._root_move_count, m, depth)
         return v
 
 
@@ -458,18 +1290,38 @@ class MinimaxPlayer(IsolationPlayer):
                 each helper function or else your agent will timeout during
                 testing.
         """
-        if self.time_left() < self.TIMER_THRESHOLD:
+        if self.deadline is not None and self.deadline.time_left is not self.time_left:
+            self.deadline.start(self.time_left, self.TIMER_THRESHOLD)
+
+        if self.deadline is not None:
+            self.deadline.tick()
+        elif self.time_left() < self.TIMER_THRESHOLD:
             raise SearchTimeout()
 
         v = float("-inf")
         m = (-1. - 1)
+        self._root_move_count = game.move_count
 
-        for cand_m in game.get_legal_moves(self):
-            cand_game = game.forecast_move(cand_m)
-            cand_v = self.min_value(cand_game, depth - 1)
-            if cand_v > v:
-                v = cand_v
-                m = cand_m
+        # a timeout leaves the moves above the aborted node pushed
+        move_count = game.move_count
+        moves = self._ordered_moves(game, self)
+        if self.symmetry:
+            moves = game.distinct_moves(moves)
+        try:
+            for cand_m in moves:
+                if self.in_place:
+                    game.push_move(cand_m)
+                    cand_v = self.min_value(game, depth - 1)
+                    game.pop_move()
+                else:
+                    cand_game = game.forecast_move(cand_m)
+                    cand_v = self.min_value(cand_game, depth - 1)
+                if cand_v > v:
+                    v = cand_v
+                    m = cand_m
+        finally:
+            while self.in_place and game.move_count > move_count:
+                game.pop_move()
 
         return m
 
@@ -477,7 +1329,155 @@ class AlphaBetaPlayer(IsolationPlayer):
     """Game-playing agent that chooses a move using iterative deepening minimax
     search with alpha-beta pruning. You must finish and test this player to
     make sure it returns a good move before the search time limit expires.
+
+    Parameters
+    ----------
+    in_place : bool (optional)
+        If True, walk the game tree on a single board with
+        `Board.push_move()`/`Board.pop_move()` instead of allocating a copy
+        per node with `Board.forecast_move()`.
+
+    tt_size : int (optional)
+        If given, keep a `TranspositionTable` of at most this many positions
+        across searches and turns. Its counters are available through
+        `self.tt.stats()`.
+
+    pv_ordering : bool (optional)
+        If True, replace the random move order with a deterministic one that
+        searches the principal variation of the previous iterative-deepening
+        pass first (or else the transposition table move).
+
+    ordering : MoveOrdering (optional)
+        If given, sort the remaining moves by killer and history tables
+        updated on every beta cutoff.
+
+    deadline : bool (optional)
+        If True, check the clock through an amortized `Deadline` instead of
+        calling `time_left()` at every node, and do not start a deepening
+        pass that is predicted not to finish.
+
+    negamax : bool (optional)
+        If True, search with the `negamax()` core (principal variation search
+        with null-window scouts) instead of `max_value()`/`min_value()`.
+
+    aspiration : float (optional)
+        If given, search each iterative-deepening pass with a window of this
+        half-width around the previous pass's value, and widen the failing
+        side to infinity on a fail-low or fail-high.
+
+    ponder : bool (optional)
+        If True, keep searching the opponent's replies in a background
+        `Ponderer` process after each move, and merge its transposition table
+        into `self.tt` (created with the default size if `tt_size` is not
+        given) when the opponent plays one of them. Call `close()` to stop
+        the process.
+
+    workers : int (optional)
+        If given, split the root moves across a `RootSplitter` pool of this
+        many worker processes, each configured with the options above,
+        instead of searching in this process. Pondering is not used with
+        a pool. Call `close()` to stop the pool.
+
+    symmetry : bool (optional)
+        If True, expand only one root move of each class of moves that are
+        equivalent under the symmetries of the root position.
+
+    endgame : bool (optional)
+        If True, play positions in which the players are separated with an
+        `EndgameSolver`, which returns an exact result and move instead of
+        searching.
+
+    proof_threshold : int (optional)
+        If given, once at most this many blank cells remain, first try to
+        prove the position with a `ProofNumberSearch` (whose table is kept
+        between turns), and play a proven win at once.
+
+    tablebase : str (optional)
+        The path of a file written by `isolation.tablebase.build()`. Below
+        the root, positions it covers are given their exact value instead
+        of being searched or scored; the file is shared through `mmap` with
+        the worker processes.
     """
+    # width of the null window used by the principal variation search scouts
+    NULL_WINDOW = 1e-6
+
+    def __init__(self, search_depth=3, score_fn=custom_score, timeout=10.,
+                 in_place=False, tt_size=None, pv_ordering=False, ordering=None,
+                 deadline=False, negamax=False, aspiration=None, ponder=False,
+                 workers=None, symmetry=False, endgame=False, proof_threshold=None,
+                 tablebase=None):
+        super().__init__(search_depth, score_fn, timeout)
+        self.in_place = in_place
+        if (ponder or workers) and not tt_size:
+            tt_size = 2**18
+        self.tt = TranspositionTable(tt_size) if tt_size else None
+        self.pv_ordering = pv_ordering
+        self.ordering = ordering
+        self.deadline = Deadline() if deadline else None
+        self.negamax_search = negamax
+        self.aspiration = aspiration
+        self.symmetry = symmetry
+        self.endgame = EndgameSolver() if endgame else None
+        self.proof_threshold = proof_threshold
+        self.pns = ProofNumberSearch() if proof_threshold else None
+        self.tablebase = _open_tablebase(tablebase) if tablebase else None
+        worker_config = dict(
+            score_fn=score_fn, timeout=timeout, in_place=True, tt_size=tt_size,
+            pv_ordering=pv_ordering, ordering=ordering, negamax=negamax,
+            symmetry=symmetry, tablebase=tablebase)
+        self.ponderer = Ponderer(worker_config) if ponder and not workers else None
+        self.splitter = RootSplitter(worker_config, workers) if workers else None
+        self.nodes = 0
+        self._root_move = (-1, -1)
+
+        # depth reached, nodes, root value and the reason the last
+        # get_move() stopped deepening: "proved win", "proved loss",
+        # "exhausted" (no leaf was cut off by depth), "budget" (the next
+        # pass was predicted not to finish), "timeout" or "solved" (by the
+        # endgame solver), and the depth the ponderer had searched the
+        # position to on a hit
+        self.search_stats = {}
+        self._root_value = 0.
+        self._depth_cutoff = False
+
+        # principal variation bookkeeping: best line below each ply of the
+        # current pass, and the PV of the last completed pass by position
+        self._root_move_count = 0
+        self._pv_lines = []
+        self._pv_moves = {}
+        self._tt_seat_key = 0
+
+    def _ordered_moves(self, game, player, ply, entry=None):
+        """Return the legal moves of `player` at search depth `ply`, with the
+        previous principal variation move (or else the move of the
+        transposition table `entry`) first when PV ordering is on, followed
+        by the killer/history order when an ordering component is set. At
+        the root, symmetric duplicates are dropped when symmetry is on.
+        """
+        first = None
+        if self.pv_ordering:
+            first = self._pv_moves.get(game.hash())
+            if first is None and entry is not None:
+                first = entry[4]
+        if self.ordering is not None and self.ordering.enabled:
+            moves = self.ordering.order(game, player, ply, first)
+        elif self.pv_ordering:
+            moves = game.get_legal_moves(player, key=lambda m: m != first)
+        else:
+            moves = game.get_legal_moves(player)
+        if self.symmetry and ply == 0:
+            moves = game.distinct_moves(moves)
+        return moves
+
+    def _remember_pv(self, game, line):
+        """Index the moves of a completed pass's principal variation by the
+        hash of the position they are played from.
+        """
+        self._pv_moves = {}
+        board = game.copy()
+        for move in line:
+            self._pv_moves[board.hash()] = move
+            board.apply_move(move)
 
     def max_value(self, game, depth, alpha, beta):
         """Helper method to Implement recursive depth-limited minimax search algorithm as described in
@@ -502,27 +1502,63 @@ class AlphaBetaPlayer(IsolationPlayer):
         utility_value: float
             utility value of the situation represented by the board encoded in the parameter game.
         """
-        if self.time_left() < self.TIMER_THRESHOLD:
+        if self.deadline is not None:
+            self.deadline.tick()
+        elif self.time_left() < self.TIMER_THRESHOLD:
             raise SearchTimeout()
 
+        self.nodes += 1
+        ply = game.move_count - self._root_move_count
+        if self.pv_ordering:
+            self._pv_lines[ply] = ()
+
+        if self.tablebase is not None and ply:
+            value = self.tablebase.probe(game, self)
+            if value is not None:
+                return value, (-1, -1)
+
         if depth == 0:
+            self._depth_cutoff = True
             return self.score(game, self), (-1,-1)
 
-        if game.is_winner(self) or game.is_loser(self):
+        if game.game_over():
             return self.score(game, self), (-1,-1)
 
+        entry = None
+        if self.tt is not None:
+            key = game.hash() ^ self._tt_seat_key
+            entry = self.tt.probe(key)
+            if entry is not None and self.tt.cutoff(entry, depth, alpha, beta):
+                if entry[2] not in (float("inf"), float("-inf")):
+                    # the stored search may itself have been cut off by depth
+                    self._depth_cutoff = True
+                return entry[2], entry[4]
+            alpha_orig = alpha
+
         v = float("-inf")
-        m = (-1. -1)
+        m = (-1, -1)
 
-        for cand_m in game.get_legal_moves(self):
-            cand_game = game.forecast_move(cand_m)
-            cand_v, _ = self.min_value(cand_game, depth - 1, alpha, beta)
+        for cand_m in self._ordered_moves(game, self, ply, entry):
+            if self.in_place:
+                game.push_move(cand_m)
+                cand_v, _ = self.min_value(game, depth - 1, alpha, beta)
+                game.pop_move()
+            else:
+                cand_game = game.forecast_move(cand_m)
+                cand_v, _ = self.min_value(cand_game, depth - 1, alpha, beta)
             if cand_v > v:
                 v = cand_v
                 m = cand_m
+                if self.pv_ordering:
+                    self._pv_lines[ply] = (m,) + self._pv_lines[ply + 1]
             if v >= beta:
-                return v, m
+                if self.ordering is not None:
+                    self.ordering.record(self, ply, m, depth)
+                break
             alpha = max(alpha, v)
+
+        if self.tt is not None:
+            self.tt.store(key, depth, v, TranspositionTable.bound(v, alpha_orig, beta), m)
         return v, m
 
     def min_value(self, game, depth, alpha, beta):
@@ -548,29 +1584,171 @@ class AlphaBetaPlayer(IsolationPlayer):
         utility_value: float
             utility value of the situation represented by the board encoded in the parameter game.
         """
-        if self.time_left() < self.TIMER_THRESHOLD:
+        if self.deadline is not None:
+            self.deadline.tick()
+        elif self.time_left() < self.TIMER_THRESHOLD:
             raise SearchTimeout()
 
+        self.nodes += 1
+        ply = game.move_count - self._root_move_count
+        if self.pv_ordering:
+            self._pv_lines[ply] = ()
+
+        if self.tablebase is not None and ply:
+            value = self.tablebase.probe(game, self)
+            if value is not None:
+                return value, (-1, -1)
+
         if depth == 0:
+            self._depth_cutoff = True
             return self.score(game, self), (-1,-1)
 
-        if game.is_winner(self) or game.is_loser(self):
+        if game.game_over():
             return self.score(game, self), (-1,-1)
 
+        entry = None
+        if self.tt is not None:
+            key = game.hash() ^ self._tt_seat_key
+            entry = self.tt.probe(key)
+            if entry is not None and self.tt.cutoff(entry, depth, alpha, beta):
+                if entry[2] not in (float("inf"), float("-inf")):
+                    # the stored search may itself have been cut off by depth
+                    self._depth_cutoff = True
+                return entry[2], entry[4]
+            beta_orig = beta
+
         v = float("+inf")
         m = (-1, -1)
 
-        for cand_m in game.get_legal_moves(game.get_opponent(self)):
-            cand_game = game.forecast_move(cand_m)
-            cand_v, _ = self.max_value(cand_game, depth - 1, alpha, beta)
+        opponent = game.get_opponent(self)
+        for cand_m in self._ordered_moves(game, opponent, ply, entry):
+            if self.in_place:
+                game.push_move(cand_m)
+                cand_v, _ = self.max_value(game, depth - 1, alpha, beta)
+                game.pop_move()
+            else:
+                cand_game = game.forecast_move(cand_m)
+                cand_v, _ = self.max_value(cand_game, depth - 1, alpha, beta)
             if cand_v < v:
                 v = cand_v
                 m = cand_m
+                if self.pv_ordering:
+                    self._pv_lines[ply] = (m,) + self._pv_lines[ply + 1]
             if v <= alpha:
-                return v, m
+                if self.ordering is not None:
+                    self.ordering.record(opponent, ply, m, depth)
+                break
             beta = min(beta, v)
+
+        if self.tt is not None:
+            self.tt.store(key, depth, v, TranspositionTable.bound(v, alpha, beta_orig), m)
         return v, m
 
+    def negamax(self, game, depth, alpha, beta, color):
+        """Negamax search with principal variation search: the first move of
+        each node is searched with the full window, the others with a null
+        window scout that is only re-searched if it fails high. Returns a
+        bare float, and the best root move is kept in `self._root_move`.
+
+        Parameters
+        ----------
+        game : isolation.Board
+            An instance of the Isolation game `Board` class representing the
+            current game state
+
+        depth : int
+            Depth is an integer representing the maximum number of plies to
+            search in the game tree before aborting
+
+        alpha, beta : float
+            The search window, from the point of view of the player to move
+
+        color : int
+            1 if this player is to move in `game`, -1 if its opponent is
+
+        Returns
+        -------
+        float
+            The value of the position for the player to move, i.e. `color`
+            times the `self.score()` scale.
+        """
+        if self.deadline is not None:
+            self.deadline.tick()
+        elif self.time_left() < self.TIMER_THRESHOLD:
+            raise SearchTimeout()
+
+        self.nodes += 1
+        ply = game.move_count - self._root_move_count
+        if self.pv_ordering:
+            self._pv_lines[ply] = ()
+
+        if self.tablebase is not None and ply:
+            value = self.tablebase.probe(game, self)
+            if value is not None:
+                return color * value
+
+        if depth == 0:
+            self._depth_cutoff = True
+            return color * self.score(game, self)
+
+        player = game.active_player
+        if game.game_over():
+            return color * self.score(game, self)
+
+        entry = None
+        if self.tt is not None:
+            # entries hold values and bounds from this player's point of view
+            key = game.hash() ^ self._tt_seat_key
+            lower, upper = (alpha, beta) if color > 0 else (-beta, -alpha)
+            entry = self.tt.probe(key)
+            if entry is not None and self.tt.cutoff(entry, depth, lower, upper):
+                if entry[2] not in (float("inf"), float("-inf")):
+                    self._depth_cutoff = True
+                if ply == 0:
+                    self._root_move = entry[4]
+                return color * entry[2]
+
+        v = float("-inf")
+        m = (-1, -1)
+        first = True
+        for cand_m in self._ordered_moves(game, player, ply, entry):
+            cand_game = game
+            if self.in_place:
+                game.push_move(cand_m)
+            else:
+                cand_game = game.forecast_move(cand_m)
+
+            if first:
+                cand_v = -self.negamax(cand_game, depth - 1, -beta, -alpha, -color)
+                first = False
+            else:
+                cand_v = -self.negamax(cand_game, depth - 1, -alpha - self.NULL_WINDOW,
+                                       -alpha, -color)
+                if alpha < cand_v < beta:
+                    cand_v = -self.negamax(cand_game, depth - 1, -beta, -alpha, -color)
+
+            if self.in_place:
+                game.pop_move()
+
+            if cand_v > v:
+                v = cand_v
+                m = cand_m
+                if self.pv_ordering:
+                    self._pv_lines[ply] = (m,) + self._pv_lines[ply + 1]
+                if v > alpha:
+                    alpha = v
+                if alpha >= beta:
+                    if self.ordering is not None:
+                        self.ordering.record(player, ply, m, depth)
+                    break
+
+        if ply == 0:
+            self._root_move = m
+        if self.tt is not None:
+            self.tt.store(key, depth, color * v,
+                          TranspositionTable.bound(color * v, lower, upper), m)
+        return v
+
     def get_move(self, game, time_left):
         """Search for the best move from the available legal moves and return a
         result before the time limit expires.
@@ -602,10 +1780,50 @@ class AlphaBetaPlayer(IsolationPlayer):
             (-1, -1) if there are no available legal moves.
         """
         self.time_left = time_left
+        self.nodes = 0
+        if self.tt is not None:
+            self.tt.new_search()
+        if self.ordering is not None:
+            self.ordering.new_search()
+        if self.deadline is not None:
+            self.deadline.start(time_left, self.TIMER_THRESHOLD)
 
         # Initialize the best move so that this function returns something
         # in case the search fails due to timeout
         best_move = (-1, -1)
+        self.search_stats = {"depth": None, "nodes": 0, "value": None,
+                             "reason": "timeout", "ponder": None}
+
+        if self.ponderer is not None:
+            pondered = self.ponderer.collect(game)
+            if pondered is not None:
+                depth, _, entries = pondered
+                self.tt.merge(entries)
+                self.search_stats["ponder"] = depth
+
+        if self.endgame is not None:
+            solved = self.endgame.solve(game, self, time_left, self.TIMER_THRESHOLD)
+            if solved is not None:
+                value, best_move = solved
+                self.search_stats.update(value=value, reason="solved")
+                return best_move
+
+        if self.pns is not None and len(game.get_blank_spaces()) <= self.proof_threshold:
+            proved = self.pns.solve(game, self, time_left, self.TIMER_THRESHOLD)
+            if proved is not None and proved[0] == float("inf"):
+                best_move = proved[1]
+                self.search_stats.update(value=proved[0], reason="proved win")
+                return best_move
+
+        if self.splitter is not None:
+            depth, best_move, value, self.nodes = self.splitter.search(
+                game, self, time_left, self.TIMER_THRESHOLD)
+            self.search_stats.update(depth=depth, nodes=self.nodes, value=value)
+            if value == float("inf"):
+                self.search_stats["reason"] = "proved win"
+            elif value == float("-inf") and depth is not None:
+                self.search_stats["reason"] = "proved loss"
+            return best_move
 
         try:
             # The try/except block will automatically catch the exception
@@ -613,15 +1831,74 @@ class AlphaBetaPlayer(IsolationPlayer):
 
             d = 0
             while True:
-                best_move = self.alphabeta(game, d)
+                pass_nodes = self.nodes
+                move = self._aspiration_search(game, d)
+                self.search_stats["depth"] = d
+                self.search_stats["value"] = self._root_value
                 d += 1
 
+                if self._root_value == float("-inf"):
+                    # every move loses against best play; keep the choice of
+                    # the last pass that could not see the loss yet, or else
+                    # any legal move
+                    if best_move == (-1, -1):
+                        legal_moves = game.get_legal_moves(self)
+                        if legal_moves:
+                            best_move = legal_moves[0]
+                    self.search_stats["reason"] = "proved loss"
+                    break
+
+                best_move = move
+                if self._root_value == float("inf"):
+                    self.search_stats["reason"] = "proved win"
+                    break
+                if not self._depth_cutoff:
+                    self.search_stats["reason"] = "exhausted"
+                    break
+                if self.deadline is not None:
+                    self.deadline.pass_done(self.nodes - pass_nodes)
+                    if not self.deadline.next_pass_fits():
+                        self.search_stats["reason"] = "budget"
+                        break
+
         except SearchTimeout:
             pass  # Handle any actions required after timeout as needed
 
+        self.search_stats["nodes"] = self.nodes
+
+        if self.ponderer is not None and best_move != (-1, -1):
+            self.ponderer.start(game.forecast_move(best_move), self)
+
         # Return the best move from the last completed search iteration
         return best_move
 
+    def close(self):
+        """Stop the background ponderer and worker pool, if any."""
+        if self.ponderer is not None:
+            self.ponderer.close()
+        if self.splitter is not None:
+            self.splitter.close()
+
+    def _aspiration_search(self, game, depth):
+        """Run the alphabeta() pass for `depth`, within an aspiration window
+        around the previous pass's value if one is configured. A fail-low or
+        fail-high re-searches with that side of the window opened up.
+        """
+        if (self.aspiration is None or depth == 0 or
+                self._root_value in (float("inf"), float("-inf"))):
+            return self.alphabeta(game, depth)
+
+        alpha = self._root_value - self.aspiration
+        beta = self._root_value + self.aspiration
+        while True:
+            move = self.alphabeta(game, depth, alpha, beta)
+            if self._root_value <= alpha and alpha != float("-inf"):
+                alpha = float("-inf")
+            elif self._root_value >= beta and beta != float("inf"):
+                beta = float("inf")
+            else:
+                return move
+
     def alphabeta(self, game, depth, alpha=float("-inf"), beta=float("inf")):
         """Implement depth-limited minimax search with alpha-beta pruning as
         described in the lectures.
@@ -667,10 +1944,62 @@ class AlphaBetaPlayer(IsolationPlayer):
                 each helper function or else your agent will timeout during
                 testing.
         """
-        if self.time_left() < self.TIMER_THRESHOLD:
-            raise SearchTimeout()
+        if self.deadline is not None and self.deadline.time_left is not self.time_left:
+            self.deadline.start(self.time_left, self.TIMER_THRESHOLD)
 
-        v, m = self.max_value(game, depth, alpha, beta)
+        if self.deadline is not None:
+            self.deadline.tick()
+        elif self.time_left() < self.TIMER_THRESHOLD:
+            raise SearchTimeout()
 
+        self._root_move_count = game.move_count
+        self._pv_lines = [()] * (depth + 2)
+        self._depth_cutoff = False
+
+        # Table values are from this player's point of view, while
+        # Board.hash() tells the players apart by seat. The same player can
+        # take either seat in different games, so key on its seat as well
+        # (not on the parity of the move count, which boards restored from a
+        # state or started by the second player do not follow).
+        self._tt_seat_key = TranspositionTable.SEAT_KEY if game._player_2 is self else 0
+
+        if self.in_place:
+            # a timeout leaves the moves above the aborted node pushed
+            move_count = game.move_count
+            try:
+                v, m = self._search_root(game, depth, alpha, beta)
+            finally:
+                while game.move_count > move_count:
+                    game.pop_move()
+        else:
+            v, m = self._search_root(game, depth, alpha, beta)
+
+        self._root_value = v
+        if self.pv_ordering:
+            self._remember_pv(game, self._pv_lines[0])
         return m
 
+    def _search_reply(self, game, depth, alpha=float("-inf"), beta=float("inf")):
+        """Search `game`, in which the opponent is to move, to `depth` with
+        the configured core, storing the results under the key this player
+        will probe when it is on move again. Used by the worker processes.
+        """
+        self._root_move_count = game.move_count
+        self._pv_lines = [()] * (depth + 2)
+        self._tt_seat_key = TranspositionTable.SEAT_KEY if game._player_2 is self else 0
+        self._depth_cutoff = False
+        if self.negamax_search:
+            self._root_value = -self.negamax(game, depth, -beta, -alpha, -1)
+        else:
+            self._root_value, _ = self.min_value(game, depth, alpha, beta)
+
+    def _search_root(self, game, depth, alpha, beta):
+        """Search the root with the configured core and return the
+        (value, move) pair.
+        """
+        if self.negamax_search:
+            self._root_move = (-1, -1)
+            v = self.negamax(game, depth, alpha, beta, 1)
+            return v, self._root_move
+        return self.max_value(game, depth, alpha, beta)
+
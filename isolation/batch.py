@@ -0,0 +1,172 @@
+"""
+Batched evaluation of many Isolation positions at once.
+
+A `BoardBatch` packs N positions of the same board size into NumPy arrays,
+so that mobility counts, terminal tests and the mobility heuristics of
+`sample_players` and `game_agent` are computed for all of them in a few
+array operations instead of one `Board` method call per position. This
+module requires NumPy, which the rest of the package does not.
+
+Players are identified by seat throughout: 0 for the first player of a
+board and 1 for the second. Methods taking `seats` accept a single seat for
+every position or an array holding one seat per position.
+"""
+import numpy as np
+
+from .rollout import knight_table
+
+
+def player_seats(boards, player):
+    """Return the seat of `player` in each of `boards` as an int array."""
+    return np.array([0 if board._player_1 == player else 1 for board in boards],
+                    dtype=np.intp)
+
+
+class BoardBatch(object):
+    """N positions on boards of the same size, stored as NumPy arrays.
+
+    Parameters
+    ----------
+    width, height : int
+        The dimensions shared by every board in the batch.
+
+    blocked : numpy.ndarray
+        Bool array of shape (N, width * height + 1); entry ``[n, idx]`` is
+        True if cell ``idx`` (``row + col * height``) of position n is
+        blocked. The extra last column stands for "off the board" and must
+        be True.
+
+    locs : numpy.ndarray
+        Int array of shape (N, 2) with the cell index of each seat, or -1
+        for a player that has not moved yet.
+
+    active : numpy.ndarray
+        Int array of shape (N,) with the seat of the player to move.
+    """
+
+    def __init__(self, width, height, blocked, locs, active):
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.blocked = blocked
+        self.locs = locs
+        self.active = active
+
+        # knight neighbours with one more row for the off-board cell, which
+        # also serves the -1 location of a player that has not moved
+        table = knight_table(width, height)
+        self._table = np.vstack([table, np.full((1, table.shape[1]), self.size,
+                                                dtype=table.dtype)])
+        self._rows = np.arange(len(active))
+
+    @classmethod
+    def from_boards(cls, boards):
+        """Pack a sequence of `isolation.Board` instances into a batch."""
+        boards = list(boards)
+        if not boards:
+            raise ValueError("Cannot build a BoardBatch without boards")
+        width, height = boards[0].width, boards[0].height
+        if any(b.width != width or b.height != height for b in boards):
+            raise ValueError("All boards in a BoardBatch must have the same size")
+
+        size = width * height
+        num_bytes = (size + 7) // 8
+        packed = b"".join(board._blocked.to_bytes(num_bytes, "little") for board in boards)
+        bits = np.unpackbits(np.frombuffer(packed, dtype=np.uint8), bitorder="little")
+        blocked = np.ones((len(boards), size + 1), dtype=bool)
+        blocked[:, :size] = bits.reshape(len(boards), num_bytes * 8)[:, :size]
+        locs = np.empty((len(boards), 2), dtype=np.intp)
+        active = np.empty(len(boards), dtype=np.intp)
+        for n, board in enumerate(boards):
+            locs[n] = board._p1_loc, board._p2_loc
+            active[n] = 0 if board.active_player == board._player_1 else 1
+        return cls(width, height, blocked, locs, active)
+
+    def __len__(self):
+        return len(self.active)
+
+    def _seats(self, seats):
+        return np.broadcast_to(np.asarray(seats, dtype=np.intp), self.active.shape)
+
+    def legal_moves(self, seats):
+        """Return the (moves, legal) arrays of shape (N, 8): the knight jumps
+        from the location of `seats` and whether each of them is legal. For
+        a player that has not moved yet every blank cell is legal instead;
+        those positions are reported through `unplaced()`.
+        """
+        locs = self.locs[self._rows, self._seats(seats)]
+        moves = self._table[locs]
+        legal = ~self.blocked[self._rows[:, None], moves]
+        return moves, legal
+
+    def unplaced(self, seats):
+        """Return a bool array marking the positions in which `seats` has
+        not moved yet.
+        """
+        return self.locs[self._rows, self._seats(seats)] < 0
+
+    def mobility(self, seats):
+        """Return the number of legal moves of `seats` in each position."""
+        _, legal = self.legal_moves(seats)
+        counts = legal.sum(axis=1)
+        unplaced = self.unplaced(seats)
+        if unplaced.any():
+            counts[unplaced] = (~self.blocked[unplaced, :self.size]).sum(axis=1)
+        return counts
+
+    def second_order_mobility(self, seats):
+        """Return, for each position, the number of open cells a knight jump
+        away from each legal move of `seats`, summed over those moves (the
+        sum computed by `game_agent.custom_score_5`).
+        """
+        moves, legal = self.legal_moves(seats)
+        open_after = ~self.blocked[self._rows[:, None, None], self._table[moves]]
+        counts = (open_after.sum(axis=2) * legal).sum(axis=1)
+        unplaced = self.unplaced(seats)
+        if unplaced.any():
+            # every blank cell is a move: weight each by its open neighbours
+            blank = ~self.blocked[unplaced]
+            rows = np.arange(blank.shape[0])[:, None, None]
+            degree = blank[rows, self._table[None, :self.size]].sum(axis=2)
+            counts[unplaced] = (degree * blank[:, :self.size]).sum(axis=1)
+        return counts
+
+    def is_terminal(self):
+        """Return a bool array marking the positions in which the player to
+        move has no legal moves.
+        """
+        return self.mobility(self.active) == 0
+
+    def is_loser(self, seats):
+        """Return a bool array marking the positions lost by `seats`."""
+        return self.is_terminal() & (self._seats(seats) == self.active)
+
+    def is_winner(self, seats):
+        """Return a bool array marking the positions won by `seats`."""
+        return self.is_terminal() & (self._seats(seats) != self.active)
+
+    def _with_outcome(self, values, seats):
+        """Convert `values` to float and replace them by -inf or +inf in the
+        positions lost or won by `seats`, as the scalar heuristics do.
+        """
+        values = values.astype(float)
+        terminal = self.is_terminal()
+        to_move = self._seats(seats) == self.active
+        values[terminal & to_move] = float("-inf")
+        values[terminal & ~to_move] = float("inf")
+        return values
+
+    def open_move_score(self, seats):
+        """Batched `sample_players.open_move_score`."""
+        return self._with_outcome(self.mobility(seats), seats)
+
+    def improved_score(self, seats):
+        """Batched `sample_players.improved_score`."""
+        seats = self._seats(seats)
+        return self._with_outcome(self.mobility(seats) - self.mobility(1 - seats), seats)
+
+    def second_order_score(self, seats):
+        """Batched `game_agent.custom_score_6`."""
+        seats = self._seats(seats)
+        return self._with_outcome(self.second_order_mobility(seats) -
+                                  self.second_order_mobility(1 - seats), seats)
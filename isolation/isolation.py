@@ -9,10 +9,131 @@ be available to project reviewers.
 """
 import random
 import timeit
-from copy import copy
 
 TIME_LIMIT_MILLIS = 150
 
+# knight move offsets as (row, column) deltas
+KNIGHT_DIRECTIONS = [(-2, -1), (-2, 1), (-1, -2), (-1, 2),
+                     (1, -2), (1, 2), (2, -1), (2, 1)]
+
+
+class _Geometry(object):
+    """Lookup tables shared by every board with the same dimensions.
+
+    Cells are indexed column-major (``idx = row + col * height``), matching the
+    layout of the original list-based board state, and bit ``idx`` of a mask
+    stands for that cell.
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.full_mask = (1 << self.size) - 1
+        self.cells = [(idx % height, idx // height) for idx in range(self.size)]
+        self.bit_cells = {1 << idx: cell for idx, cell in enumerate(self.cells)}
+
+        # the on-board knight neighbours of each cell, by index and by cell,
+        # and as a mask
+        self.neighbours = []
+        for r, c in self.cells:
+            self.neighbours.append(tuple(
+                r + dr + (c + dc) * height for dr, dc in KNIGHT_DIRECTIONS
+                if 0 <= r + dr < height and 0 <= c + dc < width))
+        self.neighbour_cells = {
+            cell: tuple(self.cells[n] for n in neighbours)
+            for cell, neighbours in zip(self.cells, self.neighbours)}
+        self.knight_masks = [sum(1 << n for n in neighbours)
+                             for neighbours in self.neighbours]
+
+        # the cells of each colour of a chessboard pattern; a knight always
+        # jumps to the other colour
+        self.colours = [(r + c) % 2 for r, c in self.cells]
+        self.colour_masks = [
+            sum(1 << idx for idx, cell_colour in enumerate(self.colours) if cell_colour == colour)
+            for colour in (0, 1)]
+
+        # Zobrist keys, seeded by the board size so that hashes agree across
+        # processes and runs
+        rng = random.Random("zobrist-{}x{}".format(width, height))
+        self.zobrist_blocked = [rng.getrandbits(64) for _ in range(self.size)]
+        self.zobrist_p1 = [rng.getrandbits(64) for _ in range(self.size)]
+        self.zobrist_p2 = [rng.getrandbits(64) for _ in range(self.size)]
+        self.zobrist_p2_to_move = rng.getrandbits(64)
+
+        # the rotations and reflections that map the board onto itself (all
+        # 8 for a square board, the 4 reflections otherwise) as cell index
+        # permutations, with their inverses and the Zobrist tables seen
+        # through each of them
+        last_row, last_col = height - 1, width - 1
+        transforms = [lambda r, c: (r, c),
+                      lambda r, c: (last_row - r, c),
+                      lambda r, c: (r, last_col - c),
+                      lambda r, c: (last_row - r, last_col - c)]
+        if width == height:
+            transforms += [lambda r, c: (c, r),
+                           lambda r, c: (c, last_row - r),
+                           lambda r, c: (last_col - c, r),
+                           lambda r, c: (last_col - c, last_row - r)]
+        self.symmetries = []
+        self.inverse_symmetries = []
+        self.symmetric_zobrist = []
+        for transform in transforms:
+            perm = []
+            for r, c in self.cells:
+                tr, tc = transform(r, c)
+                perm.append(tr + tc * height)
+            inverse = [0] * self.size
+            for idx, image in enumerate(perm):
+                inverse[image] = idx
+            self.symmetries.append(tuple(perm))
+            self.inverse_symmetries.append(tuple(inverse))
+            self.symmetric_zobrist.append(tuple(
+                [table[image] for image in perm]
+                for table in (self.zobrist_blocked, self.zobrist_p1, self.zobrist_p2)))
+
+    def mask_to_moves(self, mask):
+        """Return the (row, column) tuples of the cells set in `mask`, in
+        increasing index order.
+        """
+        bit_cells = self.bit_cells
+        moves = []
+        while mask:
+            bit = mask & -mask
+            moves.append(bit_cells[bit])
+            mask ^= bit
+        return moves
+
+
+_GEOMETRIES = {}
+
+# cell index stored for a player that has not moved yet
+_NO_CELL = -1
+
+
+try:
+    _popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+    def _popcount(mask):
+        return bin(mask).count("1")
+
+
+def _geometry(width, height):
+    """Return the cached lookup tables for a (width, height) board."""
+    key = (width, height)
+    geometry = _GEOMETRIES.get(key)
+    if geometry is None:
+        geometry = _GEOMETRIES[key] = _Geometry(width, height)
+    return geometry
+
+
+def knight_neighbours(width, height):
+    """Return a dict mapping each (row, column) cell of a (width, height)
+    board to the tuple of on-board cells one knight move away. The table is
+    built once per board size and shared; do not modify it.
+    """
+    return _geometry(width, height).neighbour_cells
+
 
 class Board(object):
     """Implement a model for the game Isolation assuming each player moves like
@@ -33,10 +154,25 @@ class Board(object):
 
     height : int (optional)
         The number of rows that the board should have.
+
+    Notes
+    -----
+    The board is stored as bitboards: bit ``row + col * height`` of
+    `_blocked` is set once a player has visited that cell, and each player
+    location is kept as a cell index (-1 before the first move). Knight-jump
+    masks for every cell are precomputed once per (width, height), so move
+    generation and the terminal tests are a handful of integer AND
+    operations. Instances have no `__dict__`, and copy() fills the slots of
+    a new instance directly.
     """
     BLANK = 0
     NOT_MOVED = None
 
+    __slots__ = ("width", "height", "move_count", "_player_1", "_player_2",
+                 "_active_player", "_inactive_player", "_geometry", "_blocked",
+                 "_p1_loc", "_p2_loc", "_hash", "_game_over", "_canonical",
+                 "_undo_stack")
+
     def __init__(self, player_1, player_2, width=7, height=7):
         self.width = width
         self.height = height
@@ -46,14 +182,163 @@ class Board(object):
         self._active_player = player_1
         self._inactive_player = player_2
 
-        # The last 3 entries of the board state includes initiative (0 for
-        # player 1, 1 for player 2) player 2 last move, and player 1 last move
-        self._board_state = [Board.BLANK] * (width * height + 3)
-        self._board_state[-1] = Board.NOT_MOVED
-        self._board_state[-2] = Board.NOT_MOVED
+        self._geometry = _geometry(width, height)
+        self._blocked = 0
+        self._p1_loc = _NO_CELL
+        self._p2_loc = _NO_CELL
+        self._hash = 0
+
+        # whether the active player is out of moves, and the
+        # canonical_key() result, or None until asked
+        self._game_over = None
+        self._canonical = None
+
+        # (move, previous location, previous blocked mask, previous hash)
+        # per push_move()
+        self._undo_stack = []
+
+    @property
+    def _board_state(self):
+        """List view of the board in the original layout: one entry per cell
+        (BLANK or 1), followed by initiative (0 for player 1, 1 for player 2),
+        player 2 last move, and player 1 last move.
+        """
+        blocked = self._blocked
+        state = [(blocked >> idx) & 1 for idx in range(self._geometry.size)]
+        state.append(int(self._active_player == self._player_2))
+        state.append(self._p2_loc if self._p2_loc >= 0 else Board.NOT_MOVED)
+        state.append(self._p1_loc if self._p1_loc >= 0 else Board.NOT_MOVED)
+        return state
+
+    @_board_state.setter
+    def _board_state(self, state):
+        blocked = 0
+        for idx in range(self._geometry.size):
+            if state[idx]:
+                blocked |= 1 << idx
+        self._blocked = blocked
+        self._p2_loc = _NO_CELL if state[-2] is Board.NOT_MOVED else state[-2]
+        self._p1_loc = _NO_CELL if state[-1] is Board.NOT_MOVED else state[-1]
+        if state[-3]:
+            self._active_player, self._inactive_player = self._player_2, self._player_1
+        else:
+            self._active_player, self._inactive_player = self._player_1, self._player_2
+        self._hash = self._zobrist_hash()
+        self._game_over = None
+        self._canonical = None
+
+    def _zobrist_hash(self):
+        """Compute the Zobrist key of the current state from scratch."""
+        geometry = self._geometry
+        key = 0
+        for idx in range(geometry.size):
+            if (self._blocked >> idx) & 1:
+                key ^= geometry.zobrist_blocked[idx]
+        if self._p1_loc >= 0:
+            key ^= geometry.zobrist_p1[self._p1_loc]
+        if self._p2_loc >= 0:
+            key ^= geometry.zobrist_p2[self._p2_loc]
+        if self._active_player == self._player_2:
+            key ^= geometry.zobrist_p2_to_move
+        return key
 
     def hash(self):
-        return str(self._board_state).__hash__()
+        """Return the 64-bit Zobrist key of the current state, covering the
+        blocked cells, both player locations and the player to move. The key
+        is updated incrementally by apply_move() and pop_move().
+        """
+        return self._hash
+
+    def canonical_key(self):
+        """Return a key shared by all positions equivalent to this one under
+        the rotations and reflections of the board, and the transform that
+        maps this position to its canonical form.
+
+        The key is the smallest `hash()` among the transformed positions.
+        Moves found in the canonical position are mapped back to this board
+        with ``transform_move(move, transform, inverse=True)``. The result
+        is cached until the next move is applied or undone.
+
+        Returns
+        -------
+        (int, int)
+            The canonical key and the index of the transform.
+        """
+        canonical = self._canonical
+        if canonical is None:
+            geometry = self._geometry
+            side = geometry.zobrist_p2_to_move if self._active_player == self._player_2 else 0
+            blocked = []
+            mask = self._blocked
+            while mask:
+                bit = mask & -mask
+                blocked.append(bit.bit_length() - 1)
+                mask ^= bit
+            p1_loc, p2_loc = self._p1_loc, self._p2_loc
+            for transform, (zobrist_blocked, zobrist_p1, zobrist_p2) in enumerate(
+                    geometry.symmetric_zobrist):
+                key = side
+                for idx in blocked:
+                    key ^= zobrist_blocked[idx]
+                if p1_loc >= 0:
+                    key ^= zobrist_p1[p1_loc]
+                if p2_loc >= 0:
+                    key ^= zobrist_p2[p2_loc]
+                if canonical is None or key < canonical[0]:
+                    canonical = (key, transform)
+            self._canonical = canonical
+        return canonical
+
+    def symmetries(self):
+        """Return the indices of the board symmetries (as used by
+        `transform_move()`) that map the current position onto itself. The
+        identity, index 0, is always included.
+        """
+        geometry = self._geometry
+        p1_loc, p2_loc = self._p1_loc, self._p2_loc
+        blocked = None
+        result = [0]
+        for transform in range(1, len(geometry.symmetries)):
+            perm = geometry.symmetries[transform]
+            if (p1_loc >= 0 and perm[p1_loc] != p1_loc or
+                    p2_loc >= 0 and perm[p2_loc] != p2_loc):
+                continue
+            if blocked is None:
+                blocked = [idx for idx in range(geometry.size) if self._blocked >> idx & 1]
+            mask = self._blocked
+            if all(mask >> perm[idx] & 1 for idx in blocked):
+                result.append(transform)
+        return result
+
+    def distinct_moves(self, moves):
+        """Return `moves` of the active player without the moves that lead
+        to a position equivalent to that of an earlier move under the
+        `symmetries()` of the current position. The order is kept.
+        """
+        geometry = self._geometry
+        perms = [geometry.symmetries[t] for t in self.symmetries()]
+        if len(perms) == 1:
+            return moves
+        height = self.height
+        seen = set()
+        result = []
+        for move in moves:
+            idx = move[0] + move[1] * height
+            if idx in seen:
+                continue
+            result.append(move)
+            seen.update(perm[idx] for perm in perms)
+        return result
+
+    def transform_move(self, move, transform, inverse=False):
+        """Map the (row, column) `move` through one of the board symmetries
+        used by `canonical_key()`, or through its inverse.
+        """
+        if move == (-1, -1):
+            return move
+        geometry = self._geometry
+        perms = geometry.inverse_symmetries if inverse else geometry.symmetries
+        return geometry.cells[perms[transform][move[0] + move[1] * self.height]]
 
     @property
     def active_player(self):
@@ -92,11 +377,23 @@ class Board(object):
 
     def copy(self):
         """ Return a deep copy of the current board. """
-        new_board = Board(self._player_1, self._player_2, width=self.width, height=self.height)
+        # the state is all immutable, so skip __init__ and share it
+        new_board = Board.__new__(Board)
+        new_board.width = self.width
+        new_board.height = self.height
         new_board.move_count = self.move_count
+        new_board._player_1 = self._player_1
+        new_board._player_2 = self._player_2
+        new_board._geometry = self._geometry
+        new_board._undo_stack = []
         new_board._active_player = self._active_player
         new_board._inactive_player = self._inactive_player
-        new_board._board_state = copy(self._board_state)
+        new_board._blocked = self._blocked
+        new_board._p1_loc = self._p1_loc
+        new_board._p2_loc = self._p2_loc
+        new_board._hash = self._hash
+        new_board._game_over = self._game_over
+        new_board._canonical = self._canonical
         return new_board
 
     def forecast_move(self, move):
@@ -134,13 +431,13 @@ class Board(object):
         """
         idx = move[0] + move[1] * self.height
         return (0 <= move[0] < self.height and 0 <= move[1] < self.width and
-                self._board_state[idx] == Board.BLANK)
+                not (self._blocked >> idx) & 1)
 
     def get_blank_spaces(self):
         """Return a list of the locations that are still available on the board.
         """
-        return [(i, j) for j in range(self.width) for i in range(self.height)
-                if self._board_state[i + j * self.height] == Board.BLANK]
+        geometry = self._geometry
+        return geometry.mask_to_moves(geometry.full_mask & ~self._blocked)
 
     def get_player_location(self, player):
         """Find the current location of the specified player on the board.
@@ -156,22 +453,30 @@ class Board(object):
             The coordinate pair (row, column) of the input player, or None
             if the player has not moved.
         """
+        idx = self._location_index(player)
+        if idx < 0:
+            return Board.NOT_MOVED
+        return self._geometry.cells[idx]
+
+    def _location_index(self, player):
+        """Return the cell index occupied by `player`, or -1 if it has not
+        moved.
+        """
         if player == self._player_1:
-            if self._board_state[-1] == Board.NOT_MOVED:
-                return Board.NOT_MOVED
-            idx = self._board_state[-1]
+            return self._p1_loc
         elif player == self._player_2:
-            if self._board_state[-2] == Board.NOT_MOVED:
-                return Board.NOT_MOVED
-            idx = self._board_state[-2]
-        else:
-            raise RuntimeError(
-                "Invalid player in get_player_location: {}".format(player))
-        w = idx // self.height
-        h = idx % self.height
-        return (h, w)
-
-    def get_legal_moves(self, player=None):
+            return self._p2_loc
+        raise RuntimeError(
+            "Invalid player in get_player_location: {}".format(player))
+
+    def _move_mask(self, player):
+        """Return the bitmask of cells `player` can move to."""
+        idx = self._location_index(player)
+        if idx < 0:
+            return self._geometry.full_mask & ~self._blocked
+        return self._geometry.knight_masks[idx] & ~self._blocked
+
+    def get_legal_moves(self, player=None, key=None):
         """Return the list of all legal moves for the specified player.
 
         Parameters
@@ -180,6 +485,11 @@ class Board(object):
             An object registered as a player in the current game. If None,
             return the legal moves for the active player on the board.
 
+        key : callable (optional)
+            Ordering hook for searches that order their own moves. If given,
+            the moves are sorted with this key function instead of being
+            shuffled, so the order is deterministic.
+
         Returns
         -------
         list<(int, int)>
@@ -188,7 +498,160 @@ class Board(object):
         """
         if player is None:
             player = self.active_player
-        return self.__get_moves(self.get_player_location(player))
+        return self.__get_moves(self._location_index(player), key)
+
+    def count_moves(self, player=None):
+        """Return the number of legal moves for the specified player (the
+        active player if None), without building the move list.
+        """
+        if player is None:
+            player = self.active_player
+        return _popcount(self._move_mask(player))
+
+    def count_moves_from(self, cell):
+        """Return the number of open cells one knight move away from the
+        on-board (row, column) `cell`, whether or not it is occupied.
+        """
+        idx = cell[0] + cell[1] * self.height
+        return _popcount(self._geometry.knight_masks[idx] & ~self._blocked)
+
+    def count_second_order_moves(self, player=None):
+        """Return the number of open cells one knight move away from each
+        legal move of the specified player (the active player if None),
+        summed over those moves.
+        """
+        if player is None:
+            player = self.active_player
+        knight_masks = self._geometry.knight_masks
+        open_mask = ~self._blocked
+        mask = self._move_mask(player)
+        total = 0
+        while mask:
+            bit = mask & -mask
+            total += _popcount(knight_masks[bit.bit_length() - 1] & open_mask)
+            mask ^= bit
+        return total
+
+    def _region(self, idx, open_mask=None):
+        """Return the mask of open cells (the cells of `open_mask`, if given)
+        reachable from cell `idx` by any sequence of knight moves.
+        """
+        knight_masks = self._geometry.knight_masks
+        if open_mask is None:
+            open_mask = ~self._blocked
+        region = 0
+        frontier = knight_masks[idx] & open_mask
+        while frontier:
+            region |= frontier
+            reached = 0
+            while frontier:
+                bit = frontier & -frontier
+                reached |= knight_masks[bit.bit_length() - 1]
+                frontier ^= bit
+            frontier = reached & open_mask & ~region
+        return region
+
+    def is_partitioned(self):
+        """Return True if both players have moved and can no longer reach
+        any common open cell, so that each plays on its own region of the
+        board from now on.
+        """
+        if self._p1_loc < 0 or self._p2_loc < 0:
+            return False
+        return not self._region(self._p1_loc) & self._region(self._p2_loc)
+
+    def longest_path(self, player=None, memo=None, check=None, limit=None):
+        """Return the length of the longest sequence of moves the specified
+        player (the active player if None) can make if its opponent never
+        gets in the way, and the first move of such a sequence.
+
+        The search is exhaustive, which is only practical once the regions
+        of the players are small, e.g. after `is_partitioned()`. Moves to
+        cells with fewer onward moves are tried first (Warnsdorff's rule),
+        which finds long paths early.
+
+        Parameters
+        ----------
+        player : object (optional)
+            A player that has already moved.
+
+        memo : dict (optional)
+            Results of earlier calls on boards of the same size, which are
+            looked up and extended. The paths of a player stay valid for the
+            rest of a game once the board is partitioned.
+
+        check : callable (optional)
+            Called at every expanded position, e.g. to raise an exception
+            when the time is up.
+
+        limit : int (optional)
+            If given, stop as soon as a path of at least this length is
+            found, and return that path instead of the longest one.
+
+        Returns
+        -------
+        (int, (int, int))
+            The path length and its first move; (0, (-1, -1)) if the player
+            has no legal moves.
+        """
+        if player is None:
+            player = self.active_player
+        loc = self._location_index(player)
+        if loc < 0:
+            raise ValueError("longest_path() needs a player that has moved")
+        if memo is None:
+            memo = {}
+        if limit is None:
+            limit = self._geometry.size
+        geometry = self._geometry
+        knight_masks = geometry.knight_masks
+        colours = geometry.colours
+        colour_masks = geometry.colour_masks
+        region = self._region
+
+        def search(loc, open_mask, need):
+            # (length, first move, exact) for the longest path from `loc`
+            # over `open_mask`, the cells reachable from `loc`; the search
+            # stops early at a path of `need` moves, which is then not known
+            # to be the longest
+            moves = knight_masks[loc] & open_mask
+            if not moves:
+                return 0, -1, True
+            key = (loc, open_mask)
+            result = memo.get(key)
+            if result is not None and (result[2] or result[0] >= need):
+                return result
+            if check is not None:
+                check()
+            # moves alternate between the colours, starting with the other
+            # colour than that of `loc`
+            other = colour_masks[1 - colours[loc]]
+            bound = min(2 * _popcount(open_mask & other),
+                        2 * _popcount(open_mask & ~other) + 1)
+            candidates = []
+            while moves:
+                bit = moves & -moves
+                moves ^= bit
+                idx = bit.bit_length() - 1
+                candidates.append((_popcount(knight_masks[idx] & open_mask), idx, bit))
+            candidates.sort()
+            best = (0, -1, True)
+            for _, idx, bit in candidates:
+                length, _, exact = search(idx, region(idx, open_mask ^ bit), need - 1)
+                length += 1
+                if length > best[0]:
+                    best = (length, idx, True)
+                if length >= bound:
+                    break
+                if not exact or length >= need:
+                    best = (best[0], best[1], False)
+                    break
+            if best[2] or result is None:
+                memo[key] = best
+            return best
+
+        length, idx, _ = search(loc, self._region(loc), limit)
+        return length, geometry.cells[idx] if idx >= 0 else (-1, -1)
 
     def apply_move(self, move):
         """Move the active player to a specified location.
@@ -200,20 +663,94 @@ class Board(object):
             the active player on the board.
         """
         idx = move[0] + move[1] * self.height
-        last_move_idx = int(self.active_player == self._player_2) + 1
-        self._board_state[-last_move_idx] = idx
-        self._board_state[idx] = 1
-        self._board_state[-3] ^= 1
+        geometry = self._geometry
+        key = self._hash ^ geometry.zobrist_p2_to_move
+        if self._active_player == self._player_2:
+            if self._p2_loc >= 0:
+                key ^= geometry.zobrist_p2[self._p2_loc]
+            key ^= geometry.zobrist_p2[idx]
+            self._p2_loc = idx
+        else:
+            if self._p1_loc >= 0:
+                key ^= geometry.zobrist_p1[self._p1_loc]
+            key ^= geometry.zobrist_p1[idx]
+            self._p1_loc = idx
+        if not (self._blocked >> idx) & 1:
+            key ^= geometry.zobrist_blocked[idx]
+            self._blocked |= 1 << idx
+        self._hash = key
+        self._game_over = None
+        self._canonical = None
         self._active_player, self._inactive_player = self._inactive_player, self._active_player
         self.move_count += 1
 
+    def push_move(self, move):
+        """Apply a move in place, recording what is needed to take it back
+        with pop_move(). This lets a search walk the game tree on a single
+        board instead of allocating a copy per node with forecast_move().
+
+        Parameters
+        ----------
+        move : (int, int)
+            A coordinate pair (row, column) indicating the next position for
+            the active player on the board.
+        """
+        if self._active_player == self._player_2:
+            prev_loc = self._p2_loc
+        else:
+            prev_loc = self._p1_loc
+        self._undo_stack.append((move, prev_loc, self._blocked, self._hash))
+        self.apply_move(move)
+
+    def pop_move(self):
+        """Take back the last move applied with push_move().
+
+        Returns
+        -------
+        (int, int)
+            The move that was taken back.
+        """
+        move, prev_loc, prev_blocked, prev_hash = self._undo_stack.pop()
+        self._active_player, self._inactive_player = self._inactive_player, self._active_player
+        if self._active_player == self._player_2:
+            self._p2_loc = prev_loc
+        else:
+            self._p1_loc = prev_loc
+        self._blocked = prev_blocked
+        self._hash = prev_hash
+        self._game_over = None
+        self._canonical = None
+        self.move_count -= 1
+        return move
+
+    def game_over(self):
+        """Test whether the game has ended, i.e. the active player has no
+        legal moves. The answer is computed once per position.
+        """
+        game_over = self._game_over
+        if game_over is None:
+            game_over = self._game_over = not self._move_mask(self._active_player)
+        return game_over
+
+    def terminal_value(self, player):
+        """Return +inf if the specified player has won the game, -inf if it
+        has lost, and None if the game is not over.
+        """
+        if not self.game_over():
+            return None
+        if player == self._inactive_player:
+            return float("inf")
+        if player == self._active_player:
+            return float("-inf")
+        return None
+
     def is_winner(self, player):
         """ Test whether the specified player has won the game. """
-        return player == self._inactive_player and not self.get_legal_moves(self._active_player)
+        return player == self._inactive_player and self.game_over()
 
     def is_loser(self, player):
         """ Test whether the specified player has lost the game. """
-        return player == self._active_player and not self.get_legal_moves(self._active_player)
+        return player == self._active_player and self.game_over()
 
     def utility(self, player):
         """Returns the utility of the current game state from the perspective
@@ -237,7 +774,7 @@ class Board(object):
             a value of -inf if the player has lost, and a value of 0
             otherwise.
         """
-        if not self.get_legal_moves(self._active_player):
+        if self.game_over():
 
             if player == self._inactive_player:
                 return float("inf")
@@ -247,19 +784,23 @@ class Board(object):
 
         return 0.
 
-    def __get_moves(self, loc):
+    def __get_moves(self, idx, key=None):
         """Generate the list of possible moves for an L-shaped motion (like a
-        knight in chess).
+        knight in chess) from the cell index `idx`, shuffled unless an
+        ordering `key` is given.
         """
-        if loc == Board.NOT_MOVED:
-            return self.get_blank_spaces()
-
-        r, c = loc
-        directions = [(-2, -1), (-2, 1), (-1, -2), (-1, 2),
-                      (1, -2), (1, 2), (2, -1), (2, 1)]
-        valid_moves = [(r + dr, c + dc) for dr, dc in directions
-                       if self.move_is_legal((r + dr, c + dc))]
-        random.shuffle(valid_moves)
+        if idx < 0:
+            valid_moves = self.get_blank_spaces()
+            if key is not None:
+                valid_moves.sort(key=key)
+            return valid_moves
+
+        geometry = self._geometry
+        valid_moves = geometry.mask_to_moves(geometry.knight_masks[idx] & ~self._blocked)
+        if key is None:
+            random.shuffle(valid_moves)
+        else:
+            valid_moves.sort(key=key)
         return valid_moves
 
     def print_board(self):
@@ -271,8 +812,8 @@ class Board(object):
         the location of each player and indicating which cells have been
         blocked, and which remain open.
         """
-        p1_loc = self._board_state[-1]
-        p2_loc = self._board_state[-2]
+        p1_loc = self._p1_loc
+        p2_loc = self._p2_loc
 
         col_margin = len(str(self.height - 1)) + 1
         prefix = "{:<" + "{}".format(col_margin) + "}"
@@ -282,7 +823,7 @@ class Board(object):
             out += prefix.format(i) + ' | '
             for j in range(self.width):
                 idx = i + j * self.height
-                if not self._board_state[idx]:
+                if not (self._blocked >> idx) & 1:
                     out += ' '
                 elif p1_loc == idx:
                     out += symbols[0]
@@ -0,0 +1,103 @@
+"""
+Vectorized random playouts for sampling-based players.
+
+`random_rollouts()` plays many independent random continuations of one
+position in lockstep on NumPy arrays: every rollout makes its next move in
+the same array operation, so the Python overhead is paid once per ply
+instead of once per move of every game. This module requires NumPy, which
+the rest of the package does not.
+"""
+import numpy as np
+
+from .isolation import KNIGHT_DIRECTIONS, _geometry
+
+_KNIGHT_TABLES = {}
+
+
+def knight_table(width, height):
+    """Return the knight neighbours of every cell of a (width, height) board.
+
+    The result is an int array of shape (width * height, 8) holding the
+    column-major cell index (``row + col * height``) of each knight jump.
+    Jumps that leave the board hold ``width * height``, an extra cell that
+    `random_rollouts()` keeps permanently blocked.
+    """
+    key = (width, height)
+    table = _KNIGHT_TABLES.get(key)
+    if table is None:
+        size = width * height
+        table = np.full((size, len(KNIGHT_DIRECTIONS)), size, dtype=np.intp)
+        for idx, neighbours in enumerate(_geometry(width, height).neighbours):
+            table[idx, :len(neighbours)] = neighbours
+        table.flags.writeable = False
+        _KNIGHT_TABLES[key] = table
+    return table
+
+
+def random_rollouts(game, num_rollouts, player=None, rng=None):
+    """Play `num_rollouts` uniformly random continuations of `game` to the
+    end and report who won each of them.
+
+    Parameters
+    ----------
+    game : isolation.Board
+        The starting position; it is not modified.
+
+    num_rollouts : int
+        The number of independent games to play.
+
+    player : object (optional)
+        The player whose wins are reported; defaults to the active player.
+
+    rng : numpy.random.Generator (optional)
+        The source of randomness; defaults to a freshly seeded generator.
+
+    Returns
+    -------
+    numpy.ndarray
+        A bool array of shape (num_rollouts,), True where `player` won.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    if player is None:
+        player = game.active_player
+    table = knight_table(game.width, game.height)
+    size = game.width * game.height
+
+    # one row of cells per rollout, plus the always blocked off-board cell;
+    # rows are addressed through the flat view with offsets of `stride`
+    stride = size + 1
+    start = [(game._blocked >> idx) & 1 for idx in range(size)] + [1]
+    blocked = np.empty((num_rollouts, stride), dtype=bool)
+    blocked[:] = np.array(start, dtype=bool)
+    flat = blocked.reshape(-1)
+    locs = np.empty((2, num_rollouts), dtype=np.intp)
+    locs[0], locs[1] = game._p1_loc, game._p2_loc
+
+    # seats are 0 for player 1 and 1 for player 2
+    winners = np.empty(num_rollouts, dtype=np.int8)
+    active = 0 if game.active_player == game._player_1 else 1
+    alive = np.arange(num_rollouts)
+    while alive.size:
+        if locs[active, 0] < 0:
+            # the opening move of a player may go to any blank cell
+            legal = ~blocked[alive, :size]
+            moves = np.broadcast_to(np.arange(size), legal.shape)
+        else:
+            moves = table[locs[active, alive]]
+            legal = ~flat[moves + (alive * stride)[:, None]]
+
+        stuck = ~legal.any(axis=1)
+        if stuck.any():
+            winners[alive[stuck]] = 1 - active
+            alive, moves, legal = alive[~stuck], moves[~stuck], legal[~stuck]
+
+        # a uniform choice among the legal moves: the largest random key
+        keys = rng.random(legal.shape)
+        keys[~legal] = -1.
+        dest = moves[np.arange(alive.size), keys.argmax(axis=1)]
+        flat[alive * stride + dest] = True
+        locs[active, alive] = dest
+        active = 1 - active
+
+    return winners == (0 if player == game._player_1 else 1)
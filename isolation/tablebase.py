@@ -0,0 +1,256 @@
+"""
+Endgame tablebase for positions in which the players are separated.
+
+Once `Board.is_partitioned()` holds, the game is decided by the longest
+knight paths of the two players over their own regions (see
+`Board.longest_path()`), so one table of single-player results covers every
+combination of regions. `build()` enumerates every (location, region) pair
+with at most `max_cells` reachable cells on a board geometry and solves them
+retrograde, smallest regions first, with each level split across a process
+pool. The results are written to an indexed binary file, which `Tablebase`
+reads through `mmap` so that every process using the same file shares one
+page-cached copy.
+
+File layout (all integers little-endian)::
+
+    header   magic b"ISOTB", version (u16), width, height, max_cells (u8)
+    index    width * height + 1 offsets (u64): the records of location
+             `loc` are records[index[loc]:index[loc + 1]]
+    records  region mask (ceil(width * height / 8) bytes, big-endian, so
+             that records sort by mask), path length (u8), first move cell
+             index (u8, 255 for none)
+
+The number of regions grows quickly with their size: a 7x7 board has about
+0.7 million regions of up to 5 cells, 4.8 million of up to 6 and 30 million
+of up to 7.
+"""
+import mmap
+import multiprocessing
+import struct
+
+from .isolation import _geometry, _popcount
+
+MAGIC = b"ISOTB"
+VERSION = 1
+
+_HEADER = struct.Struct("<5sHBBB")
+_NO_MOVE = 255
+
+
+def _capped_region(knight_masks, loc, open_mask, max_cells):
+    """Return the mask of cells of `open_mask` reachable from `loc`, or None
+    if there are more than `max_cells` of them.
+    """
+    region = 0
+    frontier = knight_masks[loc] & open_mask
+    while frontier:
+        region |= frontier
+        if _popcount(region) > max_cells:
+            return None
+        reached = 0
+        while frontier:
+            bit = frontier & -frontier
+            reached |= knight_masks[bit.bit_length() - 1]
+            frontier ^= bit
+        frontier = reached & open_mask & ~region
+    return region
+
+
+def region_keys(width, height, max_cells):
+    """Return the (location, region mask) pairs of a (width, height) board
+    with 1 to `max_cells` reachable cells, as one list per region size.
+
+    A region is the set of open cells a player at `location` can reach, so
+    the pairs are exactly the connected sets of cells (in the knight-move
+    graph) that contain the location.
+    """
+    knight_masks = _geometry(width, height).knight_masks
+    levels = [[] for _ in range(max_cells + 1)]
+
+    def grow(loc_bit, cells, candidates, excluded, size):
+        # every connected superset of `cells` that adds cells from
+        # `candidates` and their neighbours, but never from `excluded`
+        if size:
+            levels[size].append((loc_bit.bit_length() - 1, cells ^ loc_bit))
+        if size == max_cells:
+            return
+        while candidates:
+            bit = candidates & -candidates
+            candidates ^= bit
+            grow(loc_bit, cells | bit,
+                 (candidates | knight_masks[bit.bit_length() - 1]) & ~cells & ~excluded & ~bit,
+                 excluded, size + 1)
+            excluded |= bit
+
+    for loc in range(width * height):
+        loc_bit = 1 << loc
+        grow(loc_bit, loc_bit, knight_masks[loc], loc_bit, 0)
+    return levels
+
+
+# tables of the smaller regions, set in each worker by _init_worker()
+_WORKER = {}
+
+
+def _init_worker(width, height, solved):
+    _WORKER["knight_masks"] = _geometry(width, height).knight_masks
+    _WORKER["solved"] = solved
+
+
+def _solve_chunk(keys):
+    """Solve the (location, region) pairs of one region size from the
+    solved smaller regions: every move leaves a strictly smaller region.
+    """
+    knight_masks = _WORKER["knight_masks"]
+    solved = _WORKER["solved"]
+    results = []
+    for loc, region in keys:
+        best, best_move = 0, _NO_MOVE
+        moves = knight_masks[loc] & region
+        while moves:
+            bit = moves & -moves
+            moves ^= bit
+            idx = bit.bit_length() - 1
+            rest = _capped_region(knight_masks, idx, region ^ bit, len(knight_masks))
+            length = 1 + (solved[(idx, rest)] >> 8 if rest else 0)
+            if length > best:
+                best, best_move = length, idx
+        results.append(best << 8 | best_move)
+    return results
+
+
+def build(path, width=7, height=7, max_cells=5, processes=None, chunk_size=4096):
+    """Solve every region of at most `max_cells` cells on a (width, height)
+    board and write the tablebase to `path`.
+
+    Parameters
+    ----------
+    processes : int (optional)
+        The size of the process pool; defaults to the number of CPUs.
+
+    Returns
+    -------
+    int
+        The number of records written.
+    """
+    levels = region_keys(width, height, max_cells)
+    solved = {}
+    for keys in levels[1:]:
+        chunks = [keys[i:i + chunk_size] for i in range(0, len(keys), chunk_size)]
+        pool = multiprocessing.Pool(processes, _init_worker, (width, height, solved))
+        try:
+            results = pool.map(_solve_chunk, chunks)
+        finally:
+            pool.close()
+            pool.join()
+        for chunk, values in zip(chunks, results):
+            solved.update(zip(chunk, values))
+
+    size = width * height
+    mask_bytes = (size + 7) // 8
+    by_loc = [[] for _ in range(size)]
+    for (loc, region), value in solved.items():
+        by_loc[loc].append((region, value))
+
+    offsets = [0]
+    for records in by_loc:
+        records.sort()
+        offsets.append(offsets[-1] + len(records))
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, width, height, max_cells))
+        f.write(struct.pack("<{}Q".format(size + 1), *offsets))
+        for records in by_loc:
+            f.write(b"".join(region.to_bytes(mask_bytes, "big") + bytes((value >> 8, value & 0xff))
+                             for region, value in records))
+    return offsets[-1]
+
+
+class Tablebase(object):
+    """Read-only view of a tablebase file written by `build()`.
+
+    Parameters
+    ----------
+    path : str
+        The tablebase file.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.width, self.height, self.max_cells = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("{} is not a version {} tablebase".format(path, VERSION))
+        self.size = self.width * self.height
+        self._index = struct.unpack_from("<{}Q".format(self.size + 1), self._mmap, _HEADER.size)
+        self._records_start = _HEADER.size + 8 * (self.size + 1)
+        self._mask_bytes = (self.size + 7) // 8
+        self._record_size = self._mask_bytes + 2
+        self._knight_masks = _geometry(self.width, self.height).knight_masks
+
+    def close(self):
+        self._mmap.close()
+
+    def lookup(self, loc, region):
+        """Return the (length, first move cell index) of the longest path
+        from cell `loc` over the cells of `region`, which must be those
+        reachable from `loc`; None if the table does not hold the pair. The
+        move index is -1 when there is no move.
+        """
+        if not region:
+            return 0, -1
+        key = region.to_bytes(self._mask_bytes, "big")
+        data, record_size, mask_bytes = self._mmap, self._record_size, self._mask_bytes
+        lo, hi = self._index[loc], self._index[loc + 1]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = self._records_start + mid * record_size
+            found = data[start:start + mask_bytes]
+            if found < key:
+                lo = mid + 1
+            elif found > key:
+                hi = mid
+            else:
+                length, move = data[start + mask_bytes], data[start + mask_bytes + 1]
+                return length, (-1 if move == _NO_MOVE else move)
+        return None
+
+    def probe(self, game, player):
+        """Return +inf if `player` wins `game`, -inf if it loses, or None if
+        the players are not separated or their regions are not in the table.
+        """
+        if game.width != self.width or game.height != self.height:
+            return None
+        p1_loc, p2_loc = game._p1_loc, game._p2_loc
+        if p1_loc < 0 or p2_loc < 0:
+            return None
+        open_mask = ~game._blocked
+        p1_region = _capped_region(self._knight_masks, p1_loc, open_mask, self.max_cells)
+        if p1_region is None:
+            return None
+        p2_region = _capped_region(self._knight_masks, p2_loc, open_mask, self.max_cells)
+        if p2_region is None or p1_region & p2_region:
+            return None
+
+        p1_path = self.lookup(p1_loc, p1_region)
+        p2_path = self.lookup(p2_loc, p2_region)
+        if p1_path is None or p2_path is None:
+            return None
+        # the player to move wins with the strictly longer path
+        if game.active_player == game._player_1:
+            p1_wins = p1_path[0] > p2_path[0]
+        else:
+            p1_wins = p1_path[0] >= p2_path[0]
+        return float("inf") if p1_wins == (player == game._player_1) else float("-inf")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build an Isolation endgame tablebase.")
+    parser.add_argument("path")
+    parser.add_argument("--width", type=int, default=7)
+    parser.add_argument("--height", type=int, default=7)
+    parser.add_argument("--max-cells", type=int, default=5)
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+    print(build(args.path, args.width, args.height, args.max_cells, args.processes))
@@ -15,7 +15,26 @@
 //------------------------------------------------------------------------------
 // Chess Util Functions
 //------------------------------------------------------------------------------
-var COLUMNS = 'abcdefg'.split('');
+// board dimensions; set from the config by setBoardSize() (up to 15x15)
+var ALL_COLUMNS = 'abcdefghijklmno'.split(''),
+  NUM_COLUMNS = 7,
+  NUM_ROWS = 7,
+  COLUMNS = ALL_COLUMNS.slice(0, NUM_COLUMNS);
+
+function setBoardSize(columns, rows) {
+  NUM_COLUMNS = columns;
+  NUM_ROWS = rows;
+  COLUMNS = ALL_COLUMNS.slice(0, NUM_COLUMNS);
+}
+
+// split a square such as "c12" into its column index and row number
+function squareColumn(square) {
+  return COLUMNS.indexOf(square.charAt(0));
+}
+
+function squareRow(square) {
+  return parseInt(square.slice(1), 10);
+}
 
 function validMove(move) {
   // move should be a string
@@ -30,7 +49,8 @@ function validMove(move) {
 
 function validSquare(square) {
   if (typeof square !== 'string') return false;
-  return (square.search(/^[a-h][1-7]$/) !== -1);
+  if (square.search(/^[a-o][1-9][0-9]?$/) === -1) return false;
+  return (squareColumn(square) !== -1 && squareRow(square) <= NUM_ROWS);
 }
 
 function validPieceCode(code) {
@@ -46,15 +66,14 @@ function validFen(fen) {
   // we're only interested in position information
   fen = fen.replace(/ .+$/, '');
 
-  // FEN should be 8 sections separated by slashes
+  // FEN should be one section per row separated by slashes
   var chunks = fen.split('/');
-  if (chunks.length !== 7) return false;
+  if (chunks.length !== NUM_ROWS) return false;
 
   // check the piece sections
-  for (var i = 0; i < 7; i++) {
+  for (var i = 0; i < NUM_ROWS; i++) {
     if (chunks[i] === '' ||
-        chunks[i].length > 7 ||
-        chunks[i].search(/[^nN1-7]/) !== -1) {
+        chunks[i].search(/[^nN0-9]/) !== -1) {
       return false;
     }
   }
@@ -114,15 +133,15 @@ function fenToObj(fen) {
   var rows = fen.split('/');
   var position = {};
 
-  var currentRow = 7;
-  for (var i = 0; i < 7; i++) {
-    var row = rows[i].split('');
+  var currentRow = NUM_ROWS;
+  for (var i = 0; i < NUM_ROWS; i++) {
+    var row = rows[i].match(/[0-9]+|[nN]/g);
     var colIndex = 0;
 
-    // loop through each character in the FEN section
+    // loop through each token in the FEN section
     for (var j = 0; j < row.length; j++) {
       // number / empty squares
-      if (row[j].search(/[1-7]/) !== -1) {
+      if (row[j].search(/[0-9]/) !== -1) {
         var emptySquares = parseInt(row[j], 10);
         colIndex += emptySquares;
       }
@@ -149,9 +168,9 @@ function objToFen(obj) {
 
   var fen = '';
 
-  var currentRow = 7;
-  for (var i = 0; i < 7; i++) {
-    for (var j = 0; j < 7; j++) {
+  var currentRow = NUM_ROWS;
+  for (var i = 0; i < NUM_ROWS; i++) {
+    for (var j = 0; j < NUM_COLUMNS; j++) {
       var square = COLUMNS[j] + currentRow;
 
       // piece exists
@@ -165,7 +184,7 @@ function objToFen(obj) {
       }
     }
 
-    if (i !== 6) {
+    if (i !== NUM_ROWS - 1) {
       fen += '/';
     }
 
@@ -173,13 +192,7 @@ function objToFen(obj) {
   }
 
   // squeeze the numbers together
-  // haha, I love this solution...
-  fen = fen.replace(/1111111/g, '7');
-  fen = fen.replace(/111111/g, '6');
-  fen = fen.replace(/11111/g, '5');
-  fen = fen.replace(/1111/g, '4');
-  fen = fen.replace(/111/g, '3');
-  fen = fen.replace(/11/g, '2');
+  fen = fen.replace(/1+/g, function(run) { return run.length; });
 
   return fen;
 }
@@ -189,12 +202,14 @@ window['ChessBoard'] = window['ChessBoard'] || function(containerElOrId, cfg) {
 
 cfg = cfg || {};
 
+setBoardSize(cfg.columns || 7, cfg.rows || 7);
+
 //------------------------------------------------------------------------------
 // Constants
 //------------------------------------------------------------------------------
 
 var MINIMUM_JQUERY_VERSION = '1.7.0',
-  START_FEN = '7/7/7/7/7/7/7/7',
+  START_FEN = new Array(NUM_ROWS + 1).join('/' + NUM_COLUMNS).slice(1),
   START_POSITION = fenToObj(START_FEN);
 
 // use unique class names to prevent clashing with anything else on the page
@@ -495,8 +510,8 @@ function expandConfig() {
 // calculates square size based on the width of the container
 // got a little CSS black magic here, so let me explain:
 // get the width of the container element (could be anything), reduce by 1 for
-// fudge factor, and then keep reducing until we find an exact mod 8 for
-// our square size
+// fudge factor, and then keep reducing until we find an exact multiple of
+// the number of columns for our square size
 function calculateSquareSize() {
   var containerWidth = parseInt(containerEl.css('width'), 10);
 
@@ -508,18 +523,18 @@ function calculateSquareSize() {
   // pad one pixel
   var boardWidth = containerWidth - 1;
 
-  while (boardWidth % 7 !== 0 && boardWidth > 0) {
+  while (boardWidth % NUM_COLUMNS !== 0 && boardWidth > 0) {
     boardWidth--;
   }
 
-  return (boardWidth / 7);
+  return (boardWidth / NUM_COLUMNS);
 }
 
 // create random IDs for elements
 function createElIds() {
   // squares on the board
   for (var i = 0; i < COLUMNS.length; i++) {
-    for (var j = 1; j <= 7; j++) {
+    for (var j = 1; j <= NUM_ROWS; j++) {
       var square = COLUMNS[i] + j;
       SQUARE_ELS_IDS[square] = square + '-' + createId();
     }
@@ -565,16 +580,16 @@ function buildBoard(orientation) {
 
   // algebraic notation / orientation
   var alpha = deepCopy(COLUMNS);
-  var row = 7;
+  var row = NUM_ROWS;
   if (orientation === 'black') {
     alpha.reverse();
     row = 1;
   }
 
   var squareColor = 'white';
-  for (var i = 0; i < 7; i++) {
+  for (var i = 0; i < NUM_ROWS; i++) {
     html += '<div class="' + CSS.row + '">';
-    for (var j = 0; j < 7; j++) {
+    for (var j = 0; j < NUM_COLUMNS; j++) {
       var square = alpha[j] + row;
 
       html += '<div class="' + CSS.square + ' ' + CSS[squareColor] + ' ' +
@@ -586,7 +601,7 @@ function buildBoard(orientation) {
       if (cfg.showNotation === true) {
         // alpha notation
         if ((orientation === 'white' && row === 1) ||
-            (orientation === 'black' && row === 7)) {
+            (orientation === 'black' && row === NUM_ROWS)) {
           html += '<div class="' + CSS.notation + ' ' + CSS.alpha + '">' +
             '</div>';
         }
@@ -604,7 +619,10 @@ function buildBoard(orientation) {
     }
     html += '<div class="' + CSS.clearfix + '"></div></div>';
 
-    squareColor = (squareColor === 'white' ? 'white' : 'black');
+    // rows start on alternating colours
+    if (NUM_COLUMNS % 2 === 0) {
+      squareColor = (squareColor === 'white' ? 'black' : 'white');
+    }
 
     if (orientation === 'white') {
       row--;
@@ -748,13 +766,11 @@ function doAnimations(a, oldPos, newPos) {
 
 // returns the distance between two squares
 function squareDistance(s1, s2) {
-  s1 = s1.split('');
-  var s1x = COLUMNS.indexOf(s1[0]) + 1;
-  var s1y = parseInt(s1[1], 10);
+  var s1x = squareColumn(s1) + 1;
+  var s1y = squareRow(s1);
 
-  s2 = s2.split('');
-  var s2x = COLUMNS.indexOf(s2[0]) + 1;
-  var s2y = parseInt(s2[1], 10);
+  var s2x = squareColumn(s2) + 1;
+  var s2y = squareRow(s2);
 
   var xDelta = Math.abs(s1x - s2x);
   var yDelta = Math.abs(s1y - s2y);
@@ -768,8 +784,8 @@ function createRadius(square) {
   var squares = [];
 
   // calculate distance of all squares
-  for (var i = 0; i < 7; i++) {
-    for (var j = 0; j < 7; j++) {
+  for (var i = 0; i < NUM_COLUMNS; i++) {
+    for (var j = 0; j < NUM_ROWS; j++) {
       var s = COLUMNS[i] + (j + 1);
 
       // skip the square we're starting from
@@ -1111,7 +1127,7 @@ widget.resize = function() {
   SQUARE_SIZE = calculateSquareSize();
 
   // set board width
-  boardEl.css('width', (SQUARE_SIZE * 7) + 'px');
+  boardEl.css('width', (SQUARE_SIZE * NUM_COLUMNS) + 'px');
 
   // redraw the board
   drawBoard();
@@ -0,0 +1,205 @@
+"""Build and use an opening book for the first plies of Isolation.
+
+While a player has not moved, every blank cell is a legal move, so the
+first plies are both the widest and the shallowest searches of a game.
+`build()` searches every opening position once, offline and in parallel,
+and stores the best move of each. Positions are keyed on
+`Board.canonical_key()`, so positions that are rotations or reflections of
+each other share one entry, and moves are stored for the canonical
+position and mapped back to the board they are played on.
+
+By default the book covers every position after up to two moves, which
+includes every position `tournament.play_round()` can produce with its two
+random opening moves.
+
+File layout (all integers little-endian)::
+
+    header   magic b"ISOBK", version (u16), width, height (u8), number of
+             entries (u32)
+    entries  canonical key (u64), move cell index in the canonical
+             position (u8), sorted by key
+
+Usage::
+
+    python opening_book.py book.bin --time-limit 1000
+"""
+import argparse
+import multiprocessing
+import struct
+import time
+
+from isolation import Board
+from game_agent import AlphaBetaPlayer, MoveOrdering
+
+MAGIC = b"ISOBK"
+VERSION = 1
+
+_HEADER = struct.Struct("<5sHBBI")
+_ENTRY = struct.Struct("<QB")
+
+# search options of the players that fill the book
+BOOK_PLAYER_OPTIONS = dict(in_place=True, tt_size=2**18, pv_ordering=True,
+                           deadline=True, symmetry=True)
+
+
+def opening_positions(width=7, height=7, plies=2):
+    """Return one move sequence for each distinct position (up to symmetry)
+    reachable with at most `plies` moves, in order of increasing length.
+    """
+    positions = [()]
+    frontier = [()]
+    for _ in range(plies):
+        seen = {}
+        for history in frontier:
+            game = Board("Player1", "Player2", width, height)
+            for move in history:
+                game.apply_move(move)
+            for move in game.get_legal_moves():
+                key, _ = game.forecast_move(move).canonical_key()
+                seen.setdefault(key, history + (move,))
+        frontier = sorted(seen.values())
+        positions.extend(frontier)
+    return positions
+
+
+def _replay(player, history, width, height):
+    """Return the board after `history`, with `player` to move."""
+    players = (player, "Opponent") if len(history) % 2 == 0 else ("Opponent", player)
+    game = Board(players[0], players[1], width, height)
+    for move in history:
+        game.apply_move(move)
+    return game
+
+
+def _search_position(job):
+    """Search one book position and return its (canonical key, canonical
+    move cell index), or None if the player to move has no moves.
+    """
+    history, width, height, time_limit, options = job
+    player = AlphaBetaPlayer(ordering=MoveOrdering(), **options)
+    game = _replay(player, history, width, height)
+    if not game.get_legal_moves():
+        return None
+    move = (-1, -1)
+    while move == (-1, -1):
+        # a busy machine can time out before the first pass completes; the
+        # position has moves, so search again with more time
+        start = time.time()
+        move = player.get_move(game, lambda: time_limit - (time.time() - start) * 1000)
+        time_limit *= 2
+    key, transform = game.canonical_key()
+    row, col = game.transform_move(move, transform)
+    return key, row + col * height
+
+
+def build(path, width=7, height=7, plies=2, time_limit=1000., processes=None,
+          **options):
+    """Search every opening position for `time_limit` milliseconds and write
+    the book to `path`.
+
+    Parameters
+    ----------
+    plies : int (optional)
+        Cover the positions after up to this many moves.
+
+    processes : int (optional)
+        The size of the process pool; defaults to the number of CPUs.
+
+    **options
+        `AlphaBetaPlayer` keyword arguments, overriding
+        `BOOK_PLAYER_OPTIONS`.
+
+    Returns
+    -------
+    int
+        The number of entries written.
+    """
+    player_options = dict(BOOK_PLAYER_OPTIONS, **options)
+    jobs = [(history, width, height, time_limit, player_options)
+            for history in opening_positions(width, height, plies)]
+    pool = multiprocessing.Pool(processes)
+    try:
+        results = pool.map(_search_position, jobs, chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+
+    entries = sorted(result for result in results if result is not None)
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, width, height, len(entries)))
+        for key, idx in entries:
+            f.write(_ENTRY.pack(key, idx))
+    return len(entries)
+
+
+class OpeningBook(object):
+    """The entries of a book file written by `build()`.
+
+    Parameters
+    ----------
+    path : str
+        The book file.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, self.width, self.height, count = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("{} is not a version {} opening book".format(path, VERSION))
+        self._moves = {}
+        for n in range(count):
+            key, idx = _ENTRY.unpack_from(data, _HEADER.size + n * _ENTRY.size)
+            self._moves[key] = (idx % self.height, idx // self.height)
+
+    def __len__(self):
+        return len(self._moves)
+
+    def lookup(self, game):
+        """Return the book move for the player to move in `game`, or None if
+        the position is not in the book.
+        """
+        if game.width != self.width or game.height != self.height:
+            return None
+        key, transform = game.canonical_key()
+        move = self._moves.get(key)
+        if move is None:
+            return None
+        return game.transform_move(move, transform, inverse=True)
+
+
+def use_book(player, book):
+    """Wrap the `get_move()` method of `player` so that it answers from
+    `book` while the position is in it, and searches as before otherwise.
+    The player itself stays registered with the board, so its search and
+    score functions see the positions from its own point of view.
+
+    Returns
+    -------
+    object
+        `player`, whose `get_move` is now the wrapper.
+    """
+    search = player.get_move
+
+    def get_move(game, time_left):
+        move = book.lookup(game)
+        if move is not None and game.move_is_legal(move):
+            return move
+        return search(game, time_left)
+
+    player.get_move = get_move
+    return player
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build an Isolation opening book.")
+    parser.add_argument("path")
+    parser.add_argument("--width", type=int, default=7)
+    parser.add_argument("--height", type=int, default=7)
+    parser.add_argument("--plies", type=int, default=2)
+    parser.add_argument("--time-limit", type=float, default=1000.,
+                        help="search time per position in milliseconds")
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+    print(build(args.path, args.width, args.height, args.plies, args.time_limit,
+                args.processes))
@@ -30,11 +30,9 @@ def null_score(game, player):
         The heuristic value of the current game state.
     """
 
-    if game.is_loser(player):
-        return float("-inf")
-
-    if game.is_winner(player):
-        return float("inf")
+    value = game.terminal_value(player)
+    if value is not None:
+        return value
 
     return 0.
 
@@ -59,13 +57,11 @@ def open_move_score(game, player):
     float
         The heuristic value of the current game state
     """
-    if game.is_loser(player):
-        return float("-inf")
-
-    if game.is_winner(player):
-        return float("inf")
+    value = game.terminal_value(player)
+    if value is not None:
+        return value
 
-    return float(len(game.get_legal_moves(player)))
+    return float(game.count_moves(player))
 
 
 def improved_score(game, player):
@@ -89,14 +85,12 @@ def improved_score(game, player):
     float
         The heuristic value of the current game state
     """
-    if game.is_loser(player):
-        return float("-inf")
+    value = game.terminal_value(player)
+    if value is not None:
+        return value
 
-    if game.is_winner(player):
-        return float("inf")
-
-    own_moves = len(game.get_legal_moves(player))
-    opp_moves = len(game.get_legal_moves(game.get_opponent(player)))
+    own_moves = game.count_moves(player)
+    opp_moves = game.count_moves(game.get_opponent(player))
     return float(own_moves - opp_moves)
 
 
@@ -122,11 +116,9 @@ def center_score(game, player):
     float
         The heuristic value of the current game state
     """
-    if game.is_loser(player):
-        return float("-inf")
-
-    if game.is_winner(player):
-        return float("inf")
+    value = game.terminal_value(player)
+    if value is not None:
+        return value
 
     w, h = game.width / 2., game.height / 2.
     y, x = game.get_player_location(player)